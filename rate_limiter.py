@@ -0,0 +1,34 @@
+"""Rate limiting shared by every manager that calls the Vast.ai API."""
+
+from __future__ import annotations
+
+import time
+import threading
+import collections
+
+
+class SlidingWindowLimiter:
+    """Allow at most `limit` calls in any `window` seconds, across threads."""
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self._calls: collections.deque = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Sleep only if the current window already used up the call budget."""
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.window:
+                self._calls.popleft()
+
+            if len(self._calls) >= self.limit:
+                time.sleep(self.window - (now - self._calls[0]))
+                self._calls.popleft()
+
+            self._calls.append(time.monotonic())
+
+
+# One budget per process: every manager's status calls count against it
+vastai_api_limiter = SlidingWindowLimiter(limit=30, window=60.0)
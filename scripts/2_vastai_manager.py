@@ -420,12 +420,12 @@ class VastAIManager:
             True if instance is ready, False if timeout
         """
         logger.info(f"Waiting for instance {instance_id} to be ready (timeout: {timeout}s)...")
-        start_time = time.time()
+        start_time = time.monotonic()
         check_count = 0
         actual_status = 'unknown'
         last_status = {}
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
             check_count += 1
             
             # Add delay between API calls to avoid rate limiting
@@ -472,7 +472,7 @@ class VastAIManager:
             else:
                 actual_status = 'unknown'
             
-            elapsed = int(time.time() - start_time)
+            elapsed = int(time.monotonic() - start_time)
             logger.info(f"Check #{check_count} ({elapsed}s): Instance status = {actual_status}")
             
             status_msg = str(status.get('status_msg', '')).lower()
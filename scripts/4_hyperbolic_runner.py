@@ -7,12 +7,25 @@ This runs 24/7 and serves inference while PoC uses GPU rental.
 
 import os
 import json
+import asyncio
 import logging
-from typing import Optional, Dict, List, Iterator
+import functools
+from typing import Optional, Dict, List, Iterator, AsyncIterator, Tuple, Union
+import httpx
 import requests
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # stdlib json also accepts raw bytes
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 load_dotenv('config/.env')
 
 logging.basicConfig(
@@ -22,18 +35,105 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
     """Represents a chat message"""
     role: str  # system, user, assistant
-    content: str
+    content: Union[str, List[Dict]]  # multimodal messages carry a list of parts
+    
+    def as_payload(self) -> Dict:
+        """Request dict for this message"""
+        return {"role": self.role, "content": self.content}
 
 
-class HyperbolicAPIRunner:
+def _build_chat_payload(
+    model: str,
+    messages: List[ChatMessage],
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+    n: int = 1,
+    **kwargs
+) -> Dict:
+    """Build an OpenAI-style chat completion request body"""
+    messages_dict = [msg.as_payload() for msg in messages]
+    
+    payload = {
+        "model": model,
+        "messages": messages_dict,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "stream": stream,
+        **kwargs
+    }
+    if n != 1:
+        payload["n"] = n
+    return payload
+
+
+def _encode_chat_payload(
+    model: str,
+    messages: List[ChatMessage],
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+    n: int = 1,
+    **kwargs
+) -> bytes:
+    """Serialize a chat completion request body"""
+    return _json_dumps(
+        _build_chat_payload(model, messages, temperature, max_tokens, stream, n, **kwargs)
+    )
+
+
+def _split_sse_lines(buffer: bytes) -> Tuple[List[bytes], bytes, bool]:
     """
-    Drop-in replacement for vLLM using Hyperbolic API
-    Implements OpenAI-compatible interface
+    Split complete SSE lines off the front of a stream buffer
+    
+    Returns:
+        (data payloads, unconsumed remainder, whether [DONE] was seen)
     """
+    lines = buffer.split(b"\n")
+    remainder = lines.pop()
+    events = []
+    for line in lines:
+        if not line.startswith(b"data: "):
+            continue
+        data = line[6:].rstrip(b"\r")  # Remove 'data: ' prefix
+        # Only JSON objects are parsed; keep-alives and [DONE] skip the decoder
+        if data[:1] == b"{":
+            events.append(data)
+        elif data == b"[DONE]":
+            return events, b"", True
+    return events, remainder, False
+
+
+class _SSEDecoder:
+    """Incremental SSE parser shared by the sync and async stream readers"""
+    
+    __slots__ = ("buffer", "done")
+    
+    def __init__(self):
+        self.buffer = b""
+        self.done = False
+    
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """Add a received chunk and return the events it completed"""
+        self.buffer += chunk
+        if b"\n" not in chunk:
+            return []
+        events, self.buffer, self.done = _split_sse_lines(self.buffer)
+        return [_json_loads(data) for data in events]
+    
+    def flush(self) -> List[Dict]:
+        """Events from a final line the server closed without terminating"""
+        if self.done or not self.buffer:
+            return []
+        return self.feed(b"\n")
+
+
+class _HyperbolicRunnerBase:
+    """Settings, request encoding and response parsing shared by both runners"""
     
     def __init__(
         self,
@@ -50,8 +150,50 @@ class HyperbolicAPIRunner:
         
         self.headers = {
             'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}'
+            'Authorization': f'Bearer {self.api_key}',
+            'Accept-Encoding': 'gzip, br'
         }
+    
+    def _chat_request(
+        self,
+        messages: List[ChatMessage],
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        n: int,
+        **kwargs
+    ) -> Tuple[str, bytes]:
+        """URL and encoded body for a chat completion"""
+        body = _encode_chat_payload(
+            self.model, messages, temperature, max_tokens, stream, n, **kwargs
+        )
+        return f"{self.base_url}/chat/completions", body
+    
+    @staticmethod
+    def _parse_models(content: bytes) -> List[str]:
+        data = _json_loads(content)
+        if isinstance(data, dict) and 'data' in data:
+            return [model['id'] for model in data['data']]
+        return []
+
+
+class HyperbolicAPIRunner(_HyperbolicRunnerBase):
+    """
+    Drop-in replacement for vLLM using Hyperbolic API
+    Implements OpenAI-compatible interface
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        super().__init__(api_key, base_url, model)
+        
+        # Shared session keeps the TLS connection to Hyperbolic alive
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         
         logger.info("Hyperbolic API Runner initialized")
         logger.info(f"Model: {self.model}")
@@ -63,6 +205,7 @@ class HyperbolicAPIRunner:
         temperature: float = 0.7,
         max_tokens: int = 2048,
         stream: bool = False,
+        n: int = 1,
         **kwargs
     ) -> Dict:
         """
@@ -73,40 +216,25 @@ class HyperbolicAPIRunner:
             temperature: Sampling temperature (0-2)
             max_tokens: Maximum tokens to generate
             stream: Whether to stream the response
+            n: Number of completions to sample in the same request
             **kwargs: Additional parameters
         
         Returns:
             Response dict in OpenAI format
         """
-        url = f"{self.base_url}/chat/completions"
-        
-        # Convert messages to dict format
-        messages_dict = [
-            {"role": msg.role, "content": msg.content}
-            for msg in messages
-        ]
-        
-        payload = {
-            "model": self.model,
-            "messages": messages_dict,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "stream": stream,
-            **kwargs
-        }
+        url, body = self._chat_request(messages, temperature, max_tokens, stream, n, **kwargs)
         
         try:
             if stream:
-                return self._stream_completion(url, payload)
+                return self._stream_completion(url, body)
             else:
-                response = requests.post(
+                response = self.session.post(
                     url,
-                    headers=self.headers,
-                    json=payload,
-                    timeout=60
+                    data=body,
+                    timeout=(5, 60)
                 )
                 response.raise_for_status()
-                return response.json()
+                return _json_loads(response.content)
         
         except requests.RequestException as e:
             logger.error(f"API request failed: {e}")
@@ -114,29 +242,25 @@ class HyperbolicAPIRunner:
                 logger.error(f"Response: {e.response.text}")
             raise
     
-    def _stream_completion(self, url: str, payload: Dict) -> Iterator[Dict]:
+    def _stream_completion(self, url: str, body: bytes) -> Iterator[Dict]:
         """Stream completion responses"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
-                headers=self.headers,
-                json=payload,
+                data=body,
                 stream=True,
-                timeout=60
+                timeout=(5, 60)
             )
             response.raise_for_status()
             
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data = line[6:]  # Remove 'data: ' prefix
-                        if data == '[DONE]':
-                            break
-                        try:
-                            yield json.loads(data)
-                        except json.JSONDecodeError:
-                            continue
+            # Read whatever the server has flushed and split complete lines in
+            # one C-level call, instead of iter_lines() walking 512-byte reads.
+            decoder = _SSEDecoder()
+            for chunk in response.iter_content(chunk_size=65536):
+                yield from decoder.feed(chunk)
+                if decoder.done:
+                    return
+            yield from decoder.flush()
         
         except requests.RequestException as e:
             logger.error(f"Streaming failed: {e}")
@@ -148,6 +272,7 @@ class HyperbolicAPIRunner:
         temperature: float = 0.7,
         max_tokens: int = 2048,
         stream: bool = False,
+        n: int = 1,
         **kwargs
     ) -> Dict:
         """
@@ -158,6 +283,7 @@ class HyperbolicAPIRunner:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             stream: Whether to stream
+            n: Number of completions to sample in the same request
             **kwargs: Additional parameters
         
         Returns:
@@ -170,21 +296,30 @@ class HyperbolicAPIRunner:
             temperature=temperature,
             max_tokens=max_tokens,
             stream=stream,
+            n=n,
             **kwargs
         )
     
+    def multi_sample(self, messages: List[ChatMessage], n: int, **kwargs) -> List[Dict]:
+        """
+        Sample n completions for the same messages in a single request
+        
+        The prompt is prefilled once server-side instead of once per sample.
+        
+        Returns:
+            The response's choices list
+        """
+        response = self.chat_completion(messages=messages, n=n, **kwargs)
+        return response.get('choices', [])
+    
     def get_models(self) -> List[str]:
         """List available models"""
         url = f"{self.base_url}/models"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
-            
-            if isinstance(data, dict) and 'data' in data:
-                return [model['id'] for model in data['data']]
-            return []
+            return self._parse_models(response.content)
         
         except requests.RequestException as e:
             logger.error(f"Failed to fetch models: {e}")
@@ -199,6 +334,122 @@ class HyperbolicAPIRunner:
             return False
 
 
+@functools.lru_cache(maxsize=1)
+def get_runner() -> HyperbolicAPIRunner:
+    """Return a shared runner so callers reuse its warm connection pool"""
+    return HyperbolicAPIRunner()
+
+
+class AsyncHyperbolicAPIRunner(_HyperbolicRunnerBase):
+    """
+    Async variant of HyperbolicAPIRunner
+    One httpx.AsyncClient is shared so concurrent calls reuse its connections
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        super().__init__(api_key, base_url, model)
+        self.client = httpx.AsyncClient(headers=self.headers, timeout=60)
+    
+    async def __aenter__(self) -> "AsyncHyperbolicAPIRunner":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        await self.client.aclose()
+    
+    async def chat_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        stream: bool = False,
+        n: int = 1,
+        **kwargs
+    ):
+        """
+        Create a chat completion
+        
+        Returns:
+            Response dict in OpenAI format, or an async iterator of chunks
+            when stream is True
+        """
+        url, body = self._chat_request(messages, temperature, max_tokens, stream, n, **kwargs)
+        
+        if stream:
+            return self._stream_completion(url, body)
+        
+        try:
+            response = await self.client.post(url, content=body)
+            response.raise_for_status()
+            return _json_loads(response.content)
+        
+        except httpx.HTTPError as e:
+            logger.error(f"API request failed: {e}")
+            if isinstance(e, httpx.HTTPStatusError):
+                logger.error(f"Response: {e.response.text}")
+            raise
+    
+    async def _stream_completion(self, url: str, body: bytes) -> AsyncIterator[Dict]:
+        """Stream completion responses"""
+        try:
+            async with self.client.stream("POST", url, content=body) as response:
+                response.raise_for_status()
+                
+                decoder = _SSEDecoder()
+                async for chunk in response.aiter_bytes():
+                    for event in decoder.feed(chunk):
+                        yield event
+                    if decoder.done:
+                        return
+                for event in decoder.flush():
+                    yield event
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Streaming failed: {e}")
+            raise
+    
+    async def completion(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        stream: bool = False,
+        n: int = 1,
+        **kwargs
+    ):
+        """Create a text completion (non-chat)"""
+        messages = [ChatMessage(role="user", content=prompt)]
+        return await self.chat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream,
+            n=n,
+            **kwargs
+        )
+    
+    async def get_models(self) -> List[str]:
+        """List available models"""
+        url = f"{self.base_url}/models"
+        
+        try:
+            response = await self.client.get(url, timeout=10)
+            response.raise_for_status()
+            return self._parse_models(response.content)
+        
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch models: {e}")
+            return []
+
+
 class HyperbolicInferenceServer:
     """
     Simple inference server that mimics Gonka MLNode interface
@@ -206,7 +457,7 @@ class HyperbolicInferenceServer:
     """
     
     def __init__(self):
-        self.runner = HyperbolicAPIRunner()
+        self.runner = get_runner()
         logger.info("Hyperbolic Inference Server initialized")
     
     def handle_chat_completion(self, request_data: Dict) -> Dict:
@@ -219,12 +470,14 @@ class HyperbolicInferenceServer:
         temperature = request_data.get('temperature', 0.7)
         max_tokens = request_data.get('max_tokens', 2048)
         stream = request_data.get('stream', False)
+        n = request_data.get('n', 1)
         
         return self.runner.chat_completion(
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
-            stream=stream
+            stream=stream,
+            n=n
         )
     
     def handle_completion(self, request_data: Dict) -> Dict:
@@ -242,20 +495,24 @@ class HyperbolicInferenceServer:
         )
 
 
-def test_basic_completion():
-    """Test 1: Basic completion"""
+def _print_header(title: str):
     print("\n" + "="*60)
-    print("  TEST 1: Basic Text Completion")
+    print(f"  {title}")
     print("="*60 + "\n")
-    
+
+
+# The tests run concurrently, so each one awaits the API first and then prints
+# its whole report without yielding; that keeps their output from interleaving.
+
+async def test_basic_completion(runner: AsyncHyperbolicAPIRunner):
+    """Test 1: Basic completion"""
     try:
-        runner = HyperbolicAPIRunner()
-        
-        response = runner.completion(
+        response = await runner.completion(
             prompt="What is the capital of France?",
             max_tokens=50
         )
         
+        _print_header("TEST 1: Basic Text Completion")
         print("✅ API connection successful")
         print(f"\nPrompt: What is the capital of France?")
         print(f"Response: {response['choices'][0]['text'][:200]}")
@@ -271,30 +528,25 @@ def test_basic_completion():
         return True
     
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        print(f"\n❌ Basic completion test failed: {e}")
         return False
 
 
-def test_chat_completion():
+async def test_chat_completion(runner: AsyncHyperbolicAPIRunner):
     """Test 2: Chat completion"""
-    print("\n" + "="*60)
-    print("  TEST 2: Chat Completion")
-    print("="*60 + "\n")
-    
     try:
-        runner = HyperbolicAPIRunner()
-        
         messages = [
             ChatMessage(role="system", content="You are a helpful AI assistant."),
             ChatMessage(role="user", content="Explain quantum computing in one sentence.")
         ]
         
-        response = runner.chat_completion(
+        response = await runner.chat_completion(
             messages=messages,
             max_tokens=100,
             temperature=0.7
         )
         
+        _print_header("TEST 2: Chat Completion")
         print("✅ Chat completion successful")
         print(f"\nUser: Explain quantum computing in one sentence.")
         print(f"Assistant: {response['choices'][0]['message']['content']}")
@@ -302,56 +554,47 @@ def test_chat_completion():
         return True
     
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        print(f"\n❌ Chat completion test failed: {e}")
         return False
 
 
-def test_streaming():
+async def test_streaming(runner: AsyncHyperbolicAPIRunner):
     """Test 3: Streaming response"""
-    print("\n" + "="*60)
-    print("  TEST 3: Streaming Response")
-    print("="*60 + "\n")
-    
     try:
-        runner = HyperbolicAPIRunner()
-        
         messages = [
             ChatMessage(role="user", content="Count from 1 to 5.")
         ]
         
-        print("User: Count from 1 to 5.")
-        print("Assistant: ", end="", flush=True)
-        
-        response_stream = runner.chat_completion(
+        response_stream = await runner.chat_completion(
             messages=messages,
             max_tokens=50,
             stream=True
         )
         
-        for chunk in response_stream:
+        pieces = []
+        async for chunk in response_stream:
             if 'choices' in chunk and len(chunk['choices']) > 0:
                 delta = chunk['choices'][0].get('delta', {})
                 if 'content' in delta:
-                    print(delta['content'], end="", flush=True)
+                    pieces.append(delta['content'])
         
-        print("\n\n✅ Streaming successful")
+        _print_header("TEST 3: Streaming Response")
+        print("User: Count from 1 to 5.")
+        print(f"Assistant: {''.join(pieces)}")
+        print("\n✅ Streaming successful")
         return True
     
     except Exception as e:
-        print(f"\n❌ Test failed: {e}")
+        print(f"\n❌ Streaming test failed: {e}")
         return False
 
 
-def test_models_list():
+async def test_models_list(runner: AsyncHyperbolicAPIRunner):
     """Test 4: List available models"""
-    print("\n" + "="*60)
-    print("  TEST 4: Available Models")
-    print("="*60 + "\n")
-    
     try:
-        runner = HyperbolicAPIRunner()
-        models = runner.get_models()
+        models = await runner.get_models()
         
+        _print_header("TEST 4: Available Models")
         if models:
             print("✅ Available models:")
             for model in models[:5]:  # Show first 5
@@ -364,10 +607,52 @@ def test_models_list():
             return True  # Not a failure
     
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        print(f"\n❌ Models list test failed: {e}")
+        return False
+
+
+def test_sync_chat_completion():
+    """Test 5: Chat completion through the blocking runner"""
+    try:
+        runner = get_runner()
+        response = runner.chat_completion(
+            messages=[ChatMessage(role="user", content="Say hello in one word.")],
+            max_tokens=10
+        )
+        
+        _print_header("TEST 5: Sync Chat Completion")
+        print("✅ Sync chat completion successful")
+        print(f"\nAssistant: {response['choices'][0]['message']['content']}")
+        return True
+    
+    except Exception as e:
+        print(f"\n❌ Sync chat completion test failed: {e}")
         return False
 
 
+async def run_tests(tests) -> List[Tuple[str, bool]]:
+    """Run the independent API tests concurrently over one connection pool"""
+    try:
+        runner = AsyncHyperbolicAPIRunner()
+    except Exception as e:
+        print(f"\n❌ Test setup failed: {e}")
+        return [(test_name, False) for test_name, _ in tests]
+    
+    async with runner:
+        outcomes = await asyncio.gather(
+            *(test_func(runner) for _, test_func in tests),
+            return_exceptions=True
+        )
+    
+    results = []
+    for (test_name, _), outcome in zip(tests, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"\n❌ Test crashed: {outcome}")
+            outcome = False
+        results.append((test_name, outcome))
+    return results
+
+
 def main():
     """Run all tests"""
     print("\n" + "="*60)
@@ -381,14 +666,17 @@ def main():
         ("Models List", test_models_list),
     ]
     
-    results = []
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"\n❌ Test crashed: {e}")
-            results.append((test_name, False))
+    # Only the standalone run switches loops; importers keep their own policy
+    try:
+        import uvloop
+        # libuv-backed loop: less per-callback overhead on high-rate SSE streams
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    results = asyncio.run(run_tests(tests))
+    # HyperbolicInferenceServer serves through the blocking runner
+    results.append(("Sync Chat Completion", test_sync_chat_completion()))
     
     # Summary
     print("\n" + "="*60)
@@ -5,15 +5,34 @@ Deploys Gonka MLNode on Vast.ai GPU instances and integrates with Network Node
 """
 
 import os
+import sys
 import time
 import json
+import shlex
+import asyncio
 import logging
+import httpx
 import paramiko
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
+from pathlib import Path
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from ssh_utils import collect_channel, iter_channel_lines, load_private_key
+
+try:
+    import h2  # noqa: F401  # optional: enables HTTP/2 in httpx over https
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 load_dotenv('config/.env')
 
 logging.basicConfig(
@@ -34,12 +53,36 @@ class VastConnection:
 class MLNodeDeployer:
     """Deploys and manages Gonka MLNode on Vast.ai GPU instances"""
     
+    # Same key-exchange set as RemoteVLLMManager: curve25519/ECDH first,
+    # group14-sha256 as the only finite-field fallback
+    _DISABLED_ALGORITHMS = {
+        "kex": [
+            "diffie-hellman-group1-sha1",
+            "diffie-hellman-group14-sha1",
+            "diffie-hellman-group-exchange-sha1",
+            "diffie-hellman-group-exchange-sha256",
+            "diffie-hellman-group16-sha512",
+        ],
+        "keys": ["ssh-dss"],
+    }
+    
     def __init__(self):
         # Network Node configuration
         self.network_node_url = os.getenv('GONKA_NETWORK_NODE_URL', 'http://167.71.86.126:8000')
         self.admin_api_url = os.getenv('GONKA_ADMIN_API_URL', 'http://localhost:9200')
         self.host_address = os.getenv('GONKA_HOST_ADDRESS')
         
+        # One pooled session for the whole register/unregister lifecycle
+        self.admin_session = requests.Session()
+        self.admin_session.headers.update({'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.2)
+        )
+        self.admin_session.mount('http://', adapter)
+        self.admin_session.mount('https://', adapter)
+        
         # MLNode configuration
         self.mlnode_image = os.getenv('MLNODE_DOCKER_IMAGE', 'ghcr.io/product-science/mlnode:3.0.11-post1')
         self.mlnode_model = os.getenv('MLNODE_MODEL', 'Qwen/Qwen2.5-7B-Instruct')
@@ -47,6 +90,9 @@ class MLNodeDeployer:
         
         # SSH configuration
         self.ssh_key_path = os.path.expanduser(os.getenv('VASTAI_SSH_KEY_PATH', '~/.ssh/id_rsa'))
+        # Parsed on first connect; the key file may be written after start-up
+        self._pkey: Optional[paramiko.PKey] = None
+        self._ssh_clients: Dict[Tuple[str, int], paramiko.SSHClient] = {}
         
         logger.info("MLNode Deployer initialized")
         logger.info(f"Network Node: {self.network_node_url}")
@@ -93,6 +139,65 @@ class MLNodeDeployer:
             logger.error(f"Failed to get SSH info: {e}")
             return None
     
+    def _get_ssh_client(self, connection: VastConnection) -> paramiko.SSHClient:
+        """Return a connected SSH client for this instance, reusing an open one"""
+        key = (connection.host, connection.port)
+        ssh = self._ssh_clients.get(key)
+        if ssh is not None:
+            transport = ssh.get_transport()
+            if transport is not None and transport.is_active():
+                return ssh
+            ssh.close()
+            del self._ssh_clients[key]
+        
+        if self._pkey is None:
+            try:
+                self._pkey = load_private_key(self.ssh_key_path)
+            except (paramiko.SSHException, OSError, ValueError) as e:
+                # Encrypted or unreadable keys fail this connect, not the deployer
+                raise paramiko.SSHException(f"Cannot load SSH key {self.ssh_key_path}: {e}") from e
+        
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        logger.debug(f"Connecting to {connection.host}:{connection.port}...")
+        ssh.connect(
+            hostname=connection.host,
+            port=connection.port,
+            username=connection.username,
+            pkey=self._pkey,
+            allow_agent=False,
+            look_for_keys=False,
+            disabled_algorithms=self._DISABLED_ALGORITHMS,
+            timeout=30,
+            banner_timeout=30
+        )
+        # Keep the session alive across long polling loops
+        ssh.get_transport().set_keepalive(30)
+        
+        self._ssh_clients[key] = ssh
+        return ssh
+    
+    def close_ssh(self, connection: VastConnection):
+        """Close the cached SSH connection to one instance, if any"""
+        ssh = self._ssh_clients.pop((connection.host, connection.port), None)
+        if ssh is not None:
+            ssh.close()
+    
+    def close_all_ssh(self):
+        """Close every cached SSH connection"""
+        for ssh in self._ssh_clients.values():
+            ssh.close()
+        self._ssh_clients.clear()
+    
+    def _open_channel(self, connection: VastConnection, command: str) -> paramiko.Channel:
+        """Start a command on its own channel of the cached transport"""
+        transport = self._get_ssh_client(connection).get_transport()
+        chan = transport.open_session()
+        logger.debug(f"Executing: {command[:100]}...")
+        chan.exec_command(command)
+        return chan
+    
     def ssh_execute(self, connection: VastConnection, command: str, timeout: int = 300) -> tuple:
         """
         Execute command via SSH
@@ -101,39 +206,12 @@ class MLNodeDeployer:
             (exit_code, stdout, stderr)
         """
         try:
-            # Create SSH client
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # Load SSH key
             if not os.path.exists(self.ssh_key_path):
                 logger.error(f"SSH key not found: {self.ssh_key_path}")
                 return (-1, "", "SSH key not found")
             
-            private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-            
-            # Connect
-            logger.debug(f"Connecting to {connection.host}:{connection.port}...")
-            ssh.connect(
-                hostname=connection.host,
-                port=connection.port,
-                username=connection.username,
-                pkey=private_key,
-                timeout=30,
-                banner_timeout=30
-            )
-            
-            # Execute command
-            logger.debug(f"Executing: {command[:100]}...")
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-            
-            exit_code = stdout.channel.recv_exit_status()
-            stdout_text = stdout.read().decode('utf-8')
-            stderr_text = stderr.read().decode('utf-8')
-            
-            ssh.close()
-            
-            return (exit_code, stdout_text, stderr_text)
+            chan = self._open_channel(connection, command)
+            return collect_channel(chan, timeout)
         
         except Exception as e:
             logger.error(f"SSH execution failed: {e}")
@@ -152,33 +230,6 @@ class MLNodeDeployer:
         """
         logger.info(f"Deploying MLNode {node_id} on {connection.host}...")
         
-        # Step 1: Check GPU
-        logger.info("Step 1: Checking GPU...")
-        exit_code, stdout, stderr = self.ssh_execute(connection, "nvidia-smi")
-        
-        if exit_code != 0:
-            logger.error(f"GPU check failed: {stderr}")
-            return False
-        
-        logger.info("✅ GPU detected")
-        
-        # Step 2: Pull Docker image
-        logger.info(f"Step 2: Pulling Docker image {self.mlnode_image}...")
-        exit_code, stdout, stderr = self.ssh_execute(
-            connection,
-            f"docker pull {self.mlnode_image}",
-            timeout=600
-        )
-        
-        if exit_code != 0:
-            logger.error(f"Docker pull failed: {stderr}")
-            return False
-        
-        logger.info("✅ Docker image pulled")
-        
-        # Step 3: Create Docker run command
-        logger.info("Step 3: Starting MLNode container...")
-        
         # Parse vLLM args
         vllm_args = self.mlnode_vllm_args.split()
         
@@ -190,38 +241,162 @@ class MLNodeDeployer:
             -p 5000:5000 \
             -e HF_HOME=/root/.cache \
             -e VLLM_ATTENTION_BACKEND=FLASHINFER \
+            --health-cmd="curl -fsS http://localhost:8080/health || exit 1" \
+            --health-interval=5s \
+            --health-retries=60 \
             {self.mlnode_image} \
             uvicorn api.app:app --host=0.0.0.0 --port=8080
         """
         
-        exit_code, stdout, stderr = self.ssh_execute(connection, docker_cmd)
+        # Steps 1-3 run as one script on a single channel. The image pull
+        # starts right away and overlaps the GPU check; set -e stops at the
+        # first failing stage and the last marker seen tells us which one.
+        deploy_script = f"""set -e
+echo MARK_GPU
+docker pull -q {self.mlnode_image} >/dev/null &
+pull_pid=$!
+nvidia-smi >/dev/null || {{ kill $pull_pid 2>/dev/null; exit 1; }}
+echo MARK_PULL
+wait $pull_pid
+echo MARK_RUN
+{docker_cmd.strip()}
+echo MARK_DONE
+"""
+        failures = {
+            "MARK_GPU": "GPU check failed",
+            "MARK_PULL": "Docker pull failed",
+            "MARK_RUN": "MLNode start failed",
+        }
         
-        if exit_code != 0:
-            logger.error(f"MLNode start failed: {stderr}")
+        stage = None
+        container_id = ""
+        stderr = bytearray()
+        
+        chan = None
+        try:
+            chan = self._open_channel(connection, f"bash -c {shlex.quote(deploy_script)}")
+            for line in iter_channel_lines(chan, timeout=1200, stderr=stderr):
+                if line.startswith("MARK_"):
+                    stage = line
+                    if stage == "MARK_GPU":
+                        logger.info("Step 1: Checking GPU...")
+                        logger.info(f"Step 2: Pulling Docker image {self.mlnode_image}...")
+                    elif stage == "MARK_PULL":
+                        logger.info("✅ GPU detected")
+                    elif stage == "MARK_RUN":
+                        logger.info("✅ Docker image pulled")
+                        logger.info("Step 3: Starting MLNode container...")
+                elif stage == "MARK_RUN" and line.strip():
+                    container_id = line.strip()
+            exit_code = chan.recv_exit_status()
+        except Exception as e:
+            logger.error(f"SSH execution failed: {e}")
+            return False
+        finally:
+            if chan is not None:
+                chan.close()
+        
+        if exit_code != 0 or stage != "MARK_DONE":
+            reason = failures.get(stage, "Deploy script failed")
+            logger.error(f"{reason}: {stderr.decode('utf-8', 'replace')}")
             return False
         
-        container_id = stdout.strip()
         logger.info(f"✅ MLNode container started: {container_id[:12]}")
         
         # Step 4: Wait for MLNode to be ready
         logger.info("Step 4: Waiting for MLNode to be ready...")
         
-        for i in range(60):  # Wait up to 5 minutes
-            time.sleep(5)
-            
-            # Check if container is still running
-            exit_code, stdout, stderr = self.ssh_execute(
-                connection,
-                f"docker ps -q --filter name=mlnode-{node_id}"
-            )
-            
-            if exit_code != 0 or not stdout.strip():
-                logger.error("Container stopped unexpectedly")
-                return False
+        if self.wait_for_container_healthy(connection, container_id):
+            logger.info("✅ MLNode is healthy")
+            return True
+        
+        # No health event: the image may lack curl, so fall back to a direct probe
+        return self._wait_for_health_endpoint(connection, node_id)
+    
+    def _wait_for_health_endpoint(
+        self,
+        connection: VastConnection,
+        node_id: str,
+        timeout: int = 60,
+        interval: float = 5.0
+    ) -> bool:
+        """
+        Probe the MLNode health endpoint until it answers or timeout expires
+        
+        Used when Docker reported no health event. Fails straight away if the
+        container is no longer running.
+        
+        Returns:
+            True once /health returns 200
+        """
+        exit_code, stdout, stderr = self.ssh_execute(
+            connection,
+            f"docker ps -q --filter name=mlnode-{node_id}"
+        )
+        
+        if exit_code != 0 or not stdout.strip():
+            logger.error("Container stopped unexpectedly")
+            return False
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                # Plain request: the admin session's retries and headers are for the admin API
+                response = requests.get(f"http://{connection.host}:8080/health", timeout=(3, 10))
+                if response.status_code == 200:
+                    logger.info("✅ MLNode health endpoint is responding")
+                    return True
+                logger.debug(f"Health probe returned HTTP {response.status_code}")
+            except requests.RequestException as e:
+                logger.debug(f"Health probe failed: {e}")
             
-            logger.info(f"MLNode starting... ({i*5}s)")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+        
+        logger.error(f"MLNode health endpoint did not respond within {timeout}s")
+        return False
+    
+    def wait_for_container_healthy(
+        self,
+        connection: VastConnection,
+        container_id: str,
+        timeout: int = 300
+    ) -> bool:
+        """
+        Block on the container's Docker health events in a single SSH command
+        
+        Args:
+            connection: SSH connection info
+            container_id: Container started by deploy_mlnode
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            True once Docker reports the container healthy
+        """
+        # Replay events since creation so a transition before we subscribe is
+        # not missed; grep exits on the first healthy/die event.
+        events_cmd = (
+            "bash -c 'grep -m1 -oE \"health_status: healthy|die\" < <("
+            f"timeout {timeout} docker events "
+            f"--since \"$(docker inspect -f {{{{.Created}}}} {container_id})\" "
+            f"--filter container={container_id} "
+            "--filter event=health_status --filter event=die "
+            "--format \"{{.Status}}\" 2>/dev/null)'"
+        )
+        
+        exit_code, stdout, stderr = self.ssh_execute(connection, events_cmd, timeout=timeout + 10)
+        event = stdout.strip()
+        
+        if event == "die":
+            logger.error("Container exited before becoming healthy")
+            return False
+        
+        if event != "health_status: healthy":
+            logger.warning(f"No health event from container within {timeout}s")
+            return False
         
-        logger.info("✅ MLNode should be ready now")
         return True
     
     def register_mlnode_with_network(
@@ -256,11 +431,10 @@ class MLNodeDeployer:
         }
         
         try:
-            response = requests.post(
+            response = self.admin_session.post(
                 f"{self.admin_api_url}/admin/v1/nodes",
-                headers={"Content-Type": "application/json"},
                 json=payload,
-                timeout=30
+                timeout=(3, 30)
             )
             
             response.raise_for_status()
@@ -286,53 +460,84 @@ class MLNodeDeployer:
         Returns:
             True if PoC completed successfully
         """
-        logger.info(f"Monitoring PoC progress for {node_id}...")
+        return asyncio.run(self.wait_for_poc_completion_many([node_id], timeout=timeout))
+    
+    async def wait_for_poc_completion_many(self, node_ids: List[str], timeout: int = 900) -> bool:
+        """
+        Wait for PoC Sprint to complete on one or more MLNodes
         
-        start_time = time.time()
+        Args:
+            node_ids: MLNode identifiers to monitor concurrently
+            timeout: Maximum time to wait in seconds
         
-        while time.time() - start_time < timeout:
+        Returns:
+            True if PoC completed on every node
+        """
+        logger.info(f"Monitoring PoC progress for {', '.join(node_ids)}...")
+        
+        # httpx only negotiates HTTP/2 through TLS ALPN, so multiplexing the
+        # polls over one connection needs h2 and an https admin URL
+        limits = httpx.Limits(max_keepalive_connections=4)
+        async with httpx.AsyncClient(
+            base_url=self.admin_api_url,
+            http2=HTTP2_AVAILABLE and self.admin_api_url.startswith('https://'),
+            limits=limits,
+            timeout=10
+        ) as client:
             try:
-                # Get MLNode status
-                response = requests.get(
-                    f"{self.admin_api_url}/admin/v1/nodes",
-                    timeout=10
+                await asyncio.wait_for(
+                    asyncio.gather(*(self._wait_one(node_id, client) for node_id in node_ids)),
+                    timeout=timeout
                 )
+            except asyncio.TimeoutError:
+                logger.warning(f"PoC monitoring timed out after {timeout}s")
+                return False
+        
+        logger.info("✅ PoC Sprint completed!")
+        return True
+    
+    async def _wait_one(self, node_id: str, client: httpx.AsyncClient):
+        """Poll the admin API until one node reports an IDLE PoC status"""
+        last_status = None
+        # Short PoCs finish early, so poll quickly at first and slow down
+        # towards 30s while the sprint is still running
+        poll_interval = 5.0
+        
+        while True:
+            try:
+                response = await client.get("/admin/v1/nodes")
                 
                 if response.status_code == 200:
-                    nodes = response.json()
-                    
                     # Find our node
-                    for node_data in nodes:
+                    for node_data in response.json():
                         if node_data.get('node', {}).get('id') == node_id:
                             state = node_data.get('state', {})
                             poc_status = state.get('poc_current_status', 'UNKNOWN')
                             
-                            logger.info(f"PoC Status: {poc_status}")
+                            if poc_status != last_status:
+                                logger.info(f"PoC Status for {node_id}: {poc_status}")
+                                last_status = poc_status
                             
                             # Check if PoC is complete
                             if poc_status == 'IDLE':
-                                logger.info("✅ PoC Sprint completed!")
-                                return True
+                                return
                             
                             break
             
             except Exception as e:
-                logger.error(f"Error checking PoC status: {e}")
+                logger.error(f"Error checking PoC status for {node_id}: {e}")
             
-            time.sleep(30)  # Check every 30 seconds
-        
-        logger.warning(f"PoC monitoring timed out after {timeout}s")
-        return False
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(30.0, poll_interval * 1.3)
     
     def unregister_mlnode(self, node_id: str) -> bool:
         """Unregister MLNode from Network Node"""
         logger.info(f"Unregistering MLNode {node_id}...")
         
         try:
-            response = requests.delete(
+            response = self.admin_session.delete(
                 f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
-                headers={"Content-Type": "application/json"},
-                timeout=30
+                timeout=(3, 30)
             )
             
             if response.status_code == 200:
@@ -356,6 +561,8 @@ class MLNodeDeployer:
         # Remove container
         self.ssh_execute(connection, f"docker rm mlnode-{node_id}")
         
+        self.close_ssh(connection)
+        
         logger.info("✅ MLNode cleaned up")
 
 
@@ -385,7 +592,7 @@ def test_deployer():
         
         # Check Network Node connectivity
         try:
-            response = requests.get(f"{deployer.admin_api_url}/admin/v1/nodes", timeout=5)
+            response = deployer.admin_session.get(f"{deployer.admin_api_url}/admin/v1/nodes", timeout=5)
             if response.status_code == 200:
                 print(f"✅ Network Node API accessible")
                 nodes = response.json()
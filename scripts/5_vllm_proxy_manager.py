@@ -6,14 +6,41 @@ MLNode runs locally on VPS, vLLM runs on rented GPU
 """
 
 import os
+import re
+import sys
 import time
 import json
+import random
+import shlex
+import functools
+import socket
+import string
+import select
+import asyncio
+import threading
+import subprocess
 import logging
 import paramiko
 import requests
-from typing import Optional, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Tuple, Iterator
+from dataclasses import dataclass
+from pathlib import Path
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from rate_limiter import vastai_api_limiter
+from ssh_utils import collect_channel, iter_channel_lines, load_private_key
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 load_dotenv('config/.env')
 
 logging.basicConfig(
@@ -23,10 +50,83 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class VLLMConfig:
+    """Remote vLLM settings, read from the environment once"""
+    admin_api_url: str
+    ssh_key_path: str
+    poc_model: str
+    inference_model: str
+    inference_port: int
+    poc_port: int
+    inference_segment: str
+    poc_segment: str
+    hardware_type: str
+    hardware_count: int
+    ssh_ready_timeout: int
+    ssh_auth_grace: int
+    quantization: str
+    vllm_startup_timeout: int
+    vllm_model_download_timeout: int
+    vllm_max_model_len: int
+    vllm_gpu_memory_util: float
+    vllm_max_num_seqs: int
+    vllm_log_path: str
+    vllm_startup_log_path: str
+    vllm_pid_path: str
+    vllm_startup_script_path: str
+    vllm_health_endpoint: str
+    vllm_models_endpoint: str
+    ssh_backend: str
+    vllm_poll_interval: float
+
+    @classmethod
+    def from_env(cls) -> "VLLMConfig":
+        env = os.environ
+        poc_model = env.get('MLNODE_POC_MODEL', env.get('MLNODE_MODEL', 'Qwen/Qwen2.5-7B-Instruct'))
+        inference_port = int(env.get('MLNODE_INFERENCE_PORT', '8000'))
+        inference_segment = env.get('MLNODE_INFERENCE_SEGMENT', '/v1')
+        return cls(
+            admin_api_url=env.get('GONKA_ADMIN_API_URL', 'http://localhost:9200'),
+            ssh_key_path=os.path.expanduser(env.get('VASTAI_SSH_KEY_PATH', '~/.ssh/id_rsa')),
+            poc_model=poc_model,
+            inference_model=env.get('MLNODE_INFERENCE_MODEL', poc_model),
+            inference_port=inference_port,
+            poc_port=int(env.get('MLNODE_POC_PORT', str(inference_port))),
+            inference_segment=inference_segment,
+            poc_segment=env.get('MLNODE_POC_SEGMENT', inference_segment),
+            hardware_type=env.get('VASTAI_GPU_TYPE', 'RTX_4090'),
+            hardware_count=int(env.get('VASTAI_NUM_GPUS', '1')),
+            ssh_ready_timeout=int(env.get('VASTAI_SSH_READY_TIMEOUT', '900')),
+            ssh_auth_grace=int(env.get('VASTAI_SSH_AUTH_GRACE', '300')),
+            quantization=env.get('MLNODE_QUANTIZATION', '').strip(),
+            vllm_startup_timeout=int(env.get('VLLM_STARTUP_TIMEOUT', '1500')),
+            vllm_model_download_timeout=int(env.get('VLLM_MODEL_DOWNLOAD_TIMEOUT', '1200')),
+            vllm_max_model_len=int(env.get('VLLM_MAX_MODEL_LEN', '2048')),
+            vllm_gpu_memory_util=float(env.get('VLLM_GPU_MEMORY_UTIL', '0.85')),
+            vllm_max_num_seqs=int(env.get('VLLM_MAX_NUM_SEQS', '64')),
+            vllm_log_path=env.get('VLLM_LOG_PATH', '/tmp/vllm.log'),
+            vllm_startup_log_path=env.get('VLLM_STARTUP_LOG_PATH', '/tmp/vllm_startup.log'),
+            vllm_pid_path=env.get('VLLM_PID_PATH', '/tmp/vllm.pid'),
+            vllm_startup_script_path=env.get('VLLM_STARTUP_SCRIPT_PATH', '/root/start_vllm.sh'),
+            vllm_health_endpoint=env.get('VLLM_HEALTH_ENDPOINT', '/v1/health'),
+            vllm_models_endpoint=env.get('VLLM_MODELS_ENDPOINT', '/v1/models'),
+            ssh_backend=env.get('VASTAI_SSH_BACKEND', 'paramiko').strip().lower(),
+            vllm_poll_interval=float(env.get('VLLM_POLL_INTERVAL', '2')),
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> VLLMConfig:
+    """Parse the environment on first use; later managers share the result"""
+    return VLLMConfig.from_env()
+
+
 class RemoteVLLMManager:
     """Manages remote vLLM on Vast.ai GPU, MLNode stays on VPS"""
 
-    FP8_CAPABLE_GPU_FAMILIES = {
+    # Longest names first so the alternation reports the most specific family
+    FP8_CAPABLE_GPU_FAMILIES = (
         "RTX 4090",
         "RTX 4080",
         "RTX 4070 Ti",
@@ -34,57 +134,88 @@ class RemoteVLLMManager:
         "H100",
         "L40S",
         "L40",
+    )
+    _FP8_RE = re.compile("|".join(map(re.escape, FP8_CAPABLE_GPU_FAMILIES)))
+
+    _PROGRESS_RE = re.compile(r'download|load|init|start|model', re.IGNORECASE)
+    # Keep key exchange on curve25519/ECDH; the finite-field DH groups cost
+    # far more CPU per handshake and every modern sshd offers the fast ones.
+    # group14-sha256 stays as the one fallback for unusual images.
+    _DISABLED_ALGORITHMS = {
+        "kex": [
+            "diffie-hellman-group1-sha1",
+            "diffie-hellman-group14-sha1",
+            "diffie-hellman-group-exchange-sha1",
+            "diffie-hellman-group-exchange-sha256",
+            "diffie-hellman-group16-sha512",
+        ],
+        "keys": ["ssh-dss"],
     }
+
+    # Log lines after which vLLM will never come up; stop waiting at once
+    _FATAL_RE = re.compile(
+        r'CUDA out of memory|OutOfMemoryError|HFValidationError|Repository Not Found'
+        r'|Failed to infer device type|No CUDA GPUs are available|address already in use',
+        re.IGNORECASE,
+    )
+    # Progress bars redraw with a bare \r, so treat it as a line break too
+    _LINE_BREAK_RE = re.compile(rb'\r\n|\r|\n')
+
+    # Admin node lists shared by every manager polling the same URL, so
+    # parallel PoC waits cost one request per refresh instead of one each
+    _nodes_cache: Dict[str, Dict] = {}
+    _nodes_cache_lock = threading.Lock()
     
     def __init__(self):
-        self.admin_api_url = os.getenv('GONKA_ADMIN_API_URL', 'http://localhost:9200')
-        self.ssh_key_path = os.path.expanduser(os.getenv('VASTAI_SSH_KEY_PATH', '~/.ssh/id_rsa'))
-        self.poc_model = os.getenv(
-            'MLNODE_POC_MODEL',
-            os.getenv('MLNODE_MODEL', 'Qwen/Qwen2.5-7B-Instruct'),
+        # Settings are parsed once per process and shared read-only
+        self.cfg = load_config()
+        self.vllm_model = self.cfg.poc_model
+        
+        # SSH connections are reused across commands, keyed by (host, port)
+        self._pkey: Optional[paramiko.PKey] = load_private_key(self.cfg.ssh_key_path)
+        self._transports: Dict[Tuple[str, int], paramiko.Transport] = {}
+        self._sftp_clients: Dict[Tuple[str, int], paramiko.SFTPClient] = {}
+        # Hosts with an OpenSSH ControlMaster socket (VASTAI_SSH_BACKEND=openssh)
+        self._control_masters: Dict[Tuple[str, int], Dict] = {}
+        # Per-host locks so concurrent bring-ups can share the caches above
+        self._host_locks: Dict[Tuple[str, int], threading.RLock] = {}
+        self._host_locks_guard = threading.Lock()
+        # nvidia-smi output per instance; the GPU is fixed for a rental, so
+        # restarts hand it to the bootstrap script instead of re-probing
+        self._gpu_info: Dict[int, str] = {}
+        
+        # One pooled session for the whole register/poll/unregister lifecycle
+        self.admin_session = requests.Session()
+        self.admin_session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False)
         )
-        self.inference_model = os.getenv('MLNODE_INFERENCE_MODEL', self.poc_model)
-        self.vllm_model = self.poc_model
-        self.inference_port = int(os.getenv('MLNODE_INFERENCE_PORT', '8000'))
-        self.poc_port = int(os.getenv('MLNODE_POC_PORT', str(self.inference_port)))
-        self.inference_segment = os.getenv('MLNODE_INFERENCE_SEGMENT', '/v1')
-        self.poc_segment = os.getenv('MLNODE_POC_SEGMENT', self.inference_segment)
-        self.hardware_type = os.getenv('VASTAI_GPU_TYPE', 'RTX_4090')
-        self.hardware_count = int(os.getenv('VASTAI_NUM_GPUS', '1'))
-        self.ssh_ready_timeout = int(os.getenv('VASTAI_SSH_READY_TIMEOUT', '900'))
-        self.ssh_auth_grace = int(os.getenv('VASTAI_SSH_AUTH_GRACE', '300'))
-        self.quantization = os.getenv('MLNODE_QUANTIZATION', '').strip()
-        self.vllm_startup_timeout = int(os.getenv('VLLM_STARTUP_TIMEOUT', '1500'))
-        self.vllm_model_download_timeout = int(os.getenv('VLLM_MODEL_DOWNLOAD_TIMEOUT', '1200'))
-        self.vllm_max_model_len = int(os.getenv('VLLM_MAX_MODEL_LEN', '2048'))
-        self.vllm_gpu_memory_util = float(os.getenv('VLLM_GPU_MEMORY_UTIL', '0.85'))
-        self.vllm_max_num_seqs = int(os.getenv('VLLM_MAX_NUM_SEQS', '64'))
-        self.vllm_log_path = os.getenv('VLLM_LOG_PATH', '/tmp/vllm.log')
-        self.vllm_startup_log_path = os.getenv('VLLM_STARTUP_LOG_PATH', '/tmp/vllm_startup.log')
-        self.vllm_pid_path = os.getenv('VLLM_PID_PATH', '/tmp/vllm.pid')
-        self.vllm_health_endpoint = os.getenv('VLLM_HEALTH_ENDPOINT', '/v1/health')
-        self.vllm_models_endpoint = os.getenv('VLLM_MODELS_ENDPOINT', '/v1/models')
+        self.admin_session.mount('http://', adapter)
+        self.admin_session.mount('https://', adapter)
+        
+        self._compile_templates()
         
         logger.info("Remote vLLM Manager initialized")
-        logger.info("PoC model: %s", self.poc_model)
-        logger.info("Inference model: %s", self.inference_model)
+        logger.info("PoC model: %s", self.cfg.poc_model)
+        logger.info("Inference model: %s", self.cfg.inference_model)
         logger.info("Using model for GPU: %s", self.vllm_model)
         logger.info(
             "SSH ready timeout: %ss (%s minutes)",
-            self.ssh_ready_timeout,
-            self.ssh_ready_timeout // 60,
+            self.cfg.ssh_ready_timeout,
+            self.cfg.ssh_ready_timeout // 60,
         )
         logger.info(
             "vLLM startup timeout: %ss (%s minutes)",
-            self.vllm_startup_timeout,
-            self.vllm_startup_timeout // 60,
+            self.cfg.vllm_startup_timeout,
+            self.cfg.vllm_startup_timeout // 60,
         )
     
     def get_ssh_connection(self, vastai_manager, instance_id: int) -> Optional[Dict]:
         """Get SSH connection details from Vast.ai instance"""
         try:
-            # Add delay to avoid rate limiting
-            time.sleep(1)
+            vastai_api_limiter.acquire()
             
             response = vastai_manager.get_instance_status(instance_id)
             if not response:
@@ -102,13 +233,13 @@ class RemoteVLLMManager:
             ssh_host = status.get('ssh_host')
             ssh_port = status.get('ssh_port', 22)
             
-            logger.info(f"🔍 SSH Details from API: host={ssh_host}, port={ssh_port}")
+            logger.info("🔍 SSH Details from API: host=%s, port=%s", ssh_host, ssh_port)
             
             if not ssh_host:
-                logger.error(f"SSH host not found in response")
-                logger.error(f"Available SSH fields:")
-                logger.error(f"  - ssh_host: {status.get('ssh_host')}")
-                logger.error(f"  - ssh_port: {status.get('ssh_port')}")
+                logger.error("SSH host not found in response")
+                logger.error("Available SSH fields:")
+                logger.error("  - ssh_host: %s", status.get('ssh_host'))
+                logger.error("  - ssh_port: %s", status.get('ssh_port'))
                 return None
             
             return {
@@ -117,7 +248,7 @@ class RemoteVLLMManager:
                 'username': 'root'
             }
         except Exception as e:
-            logger.error(f"Failed to get SSH info: {e}")
+            logger.error("Failed to get SSH info: %s", e)
             return None
     
     def wait_for_ssh_ready(self, ssh_info: Dict, max_wait: int = 300) -> bool:
@@ -131,131 +262,384 @@ class RemoteVLLMManager:
         Returns:
             True if SSH is ready
         """
-        logger.info(f"Waiting for SSH to be ready at {ssh_info['host']}:{ssh_info['port']}...")
+        logger.info("Waiting for SSH to be ready at %s:%s...", ssh_info['host'], ssh_info['port'])
         
-        start_time = time.time()
+        start_time = time.monotonic()
         attempt = 0
         auth_failures = 0
+        connect_failures = 0
         grace_applied = False
+        last_log = start_time
         
         while True:
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             if elapsed >= max_wait:
-                if auth_failures > 0 and not grace_applied and self.ssh_auth_grace > 0:
-                    max_wait += self.ssh_auth_grace
+                if auth_failures > 0 and not grace_applied and self.cfg.ssh_auth_grace > 0:
+                    max_wait += self.cfg.ssh_auth_grace
                     grace_applied = True
                     logger.warning(
                         "SSH auth failures detected; extending SSH ready timeout by %ss (total %ss).",
-                        self.ssh_auth_grace,
+                        self.cfg.ssh_auth_grace,
                         max_wait,
                     )
                 else:
                     break
 
             attempt += 1
+            delay = 1.0
             try:
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                
-                private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-                
-                ssh.connect(
-                    hostname=ssh_info['host'],
-                    port=ssh_info['port'],
-                    username=ssh_info['username'],
-                    pkey=private_key,
-                    timeout=10,
-                    banner_timeout=30
-                )
+                # A bare TCP connect is enough to tell the port isn't open yet;
+                # only spend a key exchange and auth once it accepts
+                with socket.create_connection((ssh_info['host'], ssh_info['port']), timeout=3):
+                    pass
                 
-                # Test SSH connection with a simple command
-                stdin, stdout, stderr = ssh.exec_command("echo 'SSH test successful'", timeout=5)
-                exit_code = stdout.channel.recv_exit_status()
-                
-                ssh.close()
+                if self.cfg.ssh_backend == 'openssh':
+                    exit_code, stdout, stderr = self._run_openssh(
+                        ssh_info, "echo 'SSH test successful'", timeout=20
+                    )
+                    if exit_code == 255:
+                        if 'Permission denied' in stderr:
+                            raise paramiko.ssh_exception.AuthenticationException(stderr.strip())
+                        raise ConnectionError(stderr.strip())
+                else:
+                    transport = self._get_transport(
+                        ssh_info, timeout=5, banner_timeout=10, auth_timeout=10
+                    )
+                    
+                    # Test SSH connection with a simple command
+                    chan = transport.open_session(timeout=5)
+                    chan.exec_command("echo 'SSH test successful'")
+                    exit_code, stdout, stderr = collect_channel(chan, 5)
                 
                 if exit_code == 0:
-                    logger.info(f"✅ SSH is ready and working (attempt #{attempt})")
+                    logger.info("✅ SSH is ready and working (attempt #%s)", attempt)
                     return True
                 else:
-                    logger.warning(f"SSH connection established but command failed")
+                    logger.warning("SSH connection established but command failed")
             
             except paramiko.ssh_exception.AuthenticationException:
                 auth_failures += 1
-                elapsed = int(time.time() - start_time)
+                elapsed = int(time.monotonic() - start_time)
+                # The daemon is up and auth flips as soon as the key lands,
+                # so back off from a shorter base than connect failures
+                delay = min(5.0, 0.5 * (2 ** min(auth_failures - 1, 4)))
 
-                if attempt % 6 == 0:  # Log every 30 seconds
+                if time.monotonic() - last_log >= 30:
+                    last_log = time.monotonic()
                     logger.info(
                         "SSH auth not ready yet (%ss elapsed, %s auth failures)... Retrying",
                         elapsed,
                         auth_failures,
                     )
-
-                time.sleep(5)
             except Exception as e:
-                elapsed = int(time.time() - start_time)
-                
-                if attempt % 6 == 0:  # Log every 30 seconds
-                    logger.info(f"SSH not ready yet ({elapsed}s elapsed)... Retrying")
+                connect_failures += 1
+                elapsed = int(time.monotonic() - start_time)
+                delay = min(15.0, 1.0 * (2 ** min(connect_failures - 1, 4)))
                 
-                time.sleep(5)
+                if time.monotonic() - last_log >= 30:
+                    last_log = time.monotonic()
+                    logger.info("SSH not ready yet (%ss elapsed)... Retrying", elapsed)
+            
+            time.sleep(delay + random.uniform(0, 0.5))
         
-        elapsed = int(time.time() - start_time)
-        logger.error(f"SSH failed to be ready after {elapsed}s ({max_wait}s timeout)")
+        elapsed = int(time.monotonic() - start_time)
+        logger.error("SSH failed to be ready after %ss (%ss timeout)", elapsed, max_wait)
         return False
     
-    def ssh_execute(self, ssh_info: Dict, command: str, timeout: int = 300) -> tuple:
-        """Execute command via SSH"""
+    def _host_lock(self, key: Tuple[str, int]) -> threading.RLock:
+        """Return the lock guarding the cached connection state for one host"""
+        with self._host_locks_guard:
+            return self._host_locks.setdefault(key, threading.RLock())
+
+    def _get_transport(
+        self,
+        ssh_info: Dict,
+        timeout: int = 15,
+        banner_timeout: int = 30,
+        auth_timeout: int = 30
+    ) -> paramiko.Transport:
+        """Return an authenticated transport for this host, reusing an open one"""
+        key = (ssh_info['host'], ssh_info['port'])
+        # Threads starting different hosts connect in parallel; threads on the
+        # same host wait for one handshake instead of racing their own
+        with self._host_lock(key):
+            transport = self._transports.get(key)
+            if transport is not None:
+                if transport.is_active():
+                    return transport
+                transport.close()
+                del self._transports[key]
+        
+            if self._pkey is None:
+                self._pkey = load_private_key(self.cfg.ssh_key_path)
+        
+            logger.info("SSH connecting to %s:%s...", ssh_info['host'], ssh_info['port'])
+        
+            # Drive the Transport directly: one key exchange and one publickey
+            # auth, with none of SSHClient's host-key and agent/key-file lookups
+            sock = socket.create_connection((ssh_info['host'], ssh_info['port']), timeout=timeout)
+            # Small exec/status packets shouldn't wait on Nagle; the receive
+            # buffer is left to the kernel's autotuning
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(sock, disabled_algorithms=self._DISABLED_ALGORITHMS)
+            transport.banner_timeout = banner_timeout
+            transport.auth_timeout = auth_timeout
+            try:
+                transport.start_client(timeout=timeout)
+                transport.auth_publickey(ssh_info['username'], self._pkey)
+            except Exception:
+                # Don't leave a half-open transport thread behind on each failed attempt
+                transport.close()
+                raise
+            # Keepalives surface a dead peer instead of hanging on the next
+            # command, and keep NAT mappings alive through the long idle
+            # stretch while vLLM downloads the model
+            transport.set_keepalive(30)
+        
+            self._transports[key] = transport
+            return transport
+
+    def _ssh_cmd(self, ssh_info: Dict) -> List[str]:
+        """Base argv for the system ssh client, sharing one ControlMaster socket per host"""
+        return [
+            "ssh",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath=/tmp/gonka-cm-{ssh_info['host']}-{ssh_info['port']}.sock",
+            "-o", "ControlPersist=10m",
+            "-o", "StrictHostKeyChecking=accept-new",
+            "-o", "BatchMode=yes",
+            "-o", "ConnectTimeout=10",
+            "-o", "ServerAliveInterval=30",
+            "-i", self.cfg.ssh_key_path,
+            "-p", str(ssh_info['port']),
+            f"{ssh_info['username']}@{ssh_info['host']}",
+        ]
+
+    def _run_openssh(self, ssh_info: Dict, command: str, timeout: int, stdin: Optional[str] = None) -> tuple:
+        """Run a command through the system ssh client; the first call sets up the master"""
+        self._control_masters[(ssh_info['host'], ssh_info['port'])] = ssh_info
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-            
-            logger.info(f"SSH connecting to {ssh_info['host']}:{ssh_info['port']}...")
-            
-            ssh.connect(
-                hostname=ssh_info['host'],
-                port=ssh_info['port'],
-                username=ssh_info['username'],
-                pkey=private_key,
-                timeout=15,
-                banner_timeout=30
+            # Without a payload ssh must not read the orchestrator's own stdin
+            if stdin is not None:
+                stdin_args = {'input': stdin.encode('utf-8')}
+            else:
+                stdin_args = {'stdin': subprocess.DEVNULL}
+            result = subprocess.run(
+                self._ssh_cmd(ssh_info) + [command],
+                capture_output=True,
+                timeout=timeout,
+                **stdin_args,
             )
+        except subprocess.TimeoutExpired as e:
+            stdout = (e.stdout or b"").decode('utf-8', 'replace')
+            return (-1, stdout, "Command timed out")
+        return (
+            result.returncode,
+            result.stdout.decode('utf-8', 'replace'),
+            result.stderr.decode('utf-8', 'replace'),
+        )
+
+    def close(self, ssh_info: Dict):
+        """Close the cached SSH connection to one host, leaving other hosts alone"""
+        key = (ssh_info['host'], ssh_info['port'])
+        with self._host_lock(key):
+            sftp = self._sftp_clients.pop(key, None)
+            if sftp is not None:
+                sftp.close()
+            transport = self._transports.pop(key, None)
+            if transport is not None:
+                transport.close()
+            master = self._control_masters.pop(key, None)
+            if master is not None:
+                subprocess.run(
+                    self._ssh_cmd(master) + ["-O", "exit"],
+                    stdin=subprocess.DEVNULL, capture_output=True, timeout=10
+                )
+
+    def close_all(self):
+        """Close every cached SSH connection"""
+        hosts = set(self._transports) | set(self._sftp_clients) | set(self._control_masters)
+        for host, port in hosts:
+            self.close({'host': host, 'port': port})
+    
+    def _exec_lines(self, ssh_info: Dict, command: str, timeout: int, stderr: bytearray) -> Iterator[str]:
+        """
+        Run a long command and yield its stdout lines as they arrive
+        
+        stderr is drained into the given buffer so the remote side never
+        stalls on a full window. Raises TimeoutError past the deadline.
+        """
+        deadline = time.monotonic() + timeout
+        buffer = b""
+        
+        if self.cfg.ssh_backend == 'openssh':
+            self._control_masters[(ssh_info['host'], ssh_info['port'])] = ssh_info
+            proc = subprocess.Popen(
+                self._ssh_cmd(ssh_info) + [command],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            out_fd, err_fd = proc.stdout.fileno(), proc.stderr.fileno()
+            open_fds = [out_fd, err_fd]
+            try:
+                while open_fds:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Command timed out after {timeout}s")
+                    ready, _, _ = select.select(open_fds, [], [], min(1.0, remaining))
+                    for fd in ready:
+                        data = os.read(fd, 65536)
+                        if not data:
+                            open_fds.remove(fd)
+                        elif fd == err_fd:
+                            stderr += data
+                        else:
+                            buffer += data
+                            *lines, buffer = self._LINE_BREAK_RE.split(buffer)
+                            for line in lines:
+                                yield line.decode('utf-8', 'replace')
+            finally:
+                if proc.poll() is None:
+                    proc.kill()
+                proc.wait()
+                proc.stdout.close()
+                proc.stderr.close()
+        else:
+            chan = self._get_transport(ssh_info).open_session(timeout=30)
+            chan.exec_command(command)
+            try:
+                # Read to EOF: the last line (the wait script's status) can
+                # arrive after the exit status
+                yield from iter_channel_lines(chan, max(0, deadline - time.monotonic()), stderr)
+            finally:
+                chan.close()
+        
+        if buffer:
+            yield buffer.decode('utf-8', 'replace')
+
+    def ssh_execute(
+        self,
+        ssh_info: Dict,
+        command: str,
+        timeout: int = 300,
+        shell: bool = True,
+        stdin: Optional[str] = None
+    ) -> tuple:
+        """
+        Execute command via SSH
+        
+        With shell=False the command must be a single program invocation;
+        the remote login shell exec's into it instead of forking a child.
+        stdin, if given, is written to the command and then closed.
+        """
+        if not shell:
+            command = f"exec {command}"
+        try:
+            logger.info("SSH executing: %s...", command[:50])
             
-            logger.info(f"✅ SSH connected, executing: {command[:50]}...")
+            if self.cfg.ssh_backend == 'openssh':
+                return self._run_openssh(ssh_info, command, timeout, stdin)
             
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-            exit_code = stdout.channel.recv_exit_status()
-            stdout_text = stdout.read().decode('utf-8')
-            stderr_text = stderr.read().decode('utf-8')
+            transport = self._get_transport(ssh_info)
             
-            ssh.close()
-            return (exit_code, stdout_text, stderr_text)
+            # A bare session channel on the authenticated transport; no
+            # stdin/stdout/stderr file wrappers per command
+            chan = transport.open_session(timeout=timeout)
+            chan.exec_command(command)
+            if stdin is not None:
+                chan.sendall(stdin.encode('utf-8'))
+                chan.shutdown_write()
+            return collect_channel(chan, timeout)
         
         except Exception as e:
-            logger.error(f"SSH execution failed: {e}")
+            logger.error("SSH execution failed: %s", e)
             return (-1, "", str(e))
 
-    def _tail_remote_log(self, ssh_info: Dict, path: str, lines: int = 50) -> str:
-        """Fetch the tail of a remote log file."""
-        exit_code, stdout, stderr = self.ssh_execute(
-            ssh_info,
-            f"tail -{lines} {path} 2>/dev/null || true",
-            timeout=10,
+    def ssh_execute_many(self, ssh_info: Dict, commands: List[str], timeout: int = 60) -> List[tuple]:
+        """
+        Run several commands concurrently, one channel each on the cached transport
+        
+        Returns:
+            A (exit_code, stdout, stderr) tuple per command, in order
+        """
+        if self.cfg.ssh_backend == 'openssh':
+            return [self.ssh_execute(ssh_info, command, timeout=timeout) for command in commands]
+        
+        try:
+            transport = self._get_transport(ssh_info)
+            channels = []
+            for command in commands:
+                chan = transport.open_session(timeout=timeout)
+                chan.exec_command(command)
+                channels.append(chan)
+        except Exception as e:
+            logger.error("SSH execution failed: %s", e)
+            return [(-1, "", str(e))] * len(commands)
+        
+        # The transport buffers every channel in the background, so draining
+        # them in turn still waits only as long as the slowest command
+        deadline = time.monotonic() + timeout
+        return [
+            collect_channel(chan, max(0, deadline - time.monotonic()))
+            for chan in channels
+        ]
+
+    def _get_sftp(self, ssh_info: Dict) -> paramiko.SFTPClient:
+        """Return an SFTP session on the cached connection, reopening it after a reconnect"""
+        key = (ssh_info['host'], ssh_info['port'])
+        with self._host_lock(key):
+            transport = self._get_transport(ssh_info)
+            sftp = self._sftp_clients.get(key)
+            if sftp is None or sftp.get_channel().get_transport() is not transport or sftp.get_channel().closed:
+                sftp = paramiko.SFTPClient.from_transport(transport)
+                self._sftp_clients[key] = sftp
+            return sftp
+
+    def _tail_remote_logs(self, ssh_info: Dict, paths: List[str], lines: int = 200) -> Dict[str, str]:
+        """Fetch the tails of several remote logs, keyed by path."""
+        # Read the last 64 KiB of each file over SFTP; no shell or tail is
+        # forked on an instance that may already be short on memory
+        if self.cfg.ssh_backend != 'openssh':
+            try:
+                sftp = self._get_sftp(ssh_info)
+                tails = {}
+                for path in paths:
+                    try:
+                        with sftp.open(path, 'rb') as f:
+                            size = f.stat().st_size
+                            f.seek(max(0, size - 64 * 1024))
+                            data = f.read()
+                    except FileNotFoundError:
+                        data = b""
+                    tails[path] = b"\n".join(data.splitlines()[-lines:]).decode('utf-8', 'replace').strip()
+                return tails
+            except Exception as e:
+                logger.debug("SFTP read of %s failed, falling back to tail: %s", paths, e)
+
+        command = "; ".join(
+            f"echo '---LOG:{index}---'; tail -{lines} {shlex.quote(path)} 2>/dev/null || true"
+            for index, path in enumerate(paths)
         )
+        exit_code, stdout, stderr = self.ssh_execute(ssh_info, command, timeout=10)
         if exit_code != 0:
-            logger.debug("Failed to read log %s: %s", path, stderr.strip())
-        return stdout.strip()
+            logger.debug("Failed to read logs %s: %s", paths, stderr.strip())
+
+        tails = {path: "" for path in paths}
+        for section in stdout.split("---LOG:")[1:]:
+            index, _, body = section.partition("---\n")
+            if index.isdigit() and int(index) < len(paths):
+                tails[paths[int(index)]] = body.strip()
+        return tails
 
     def _determine_quantization_flag(self, gpu_name: str, compute_cap: str) -> str:
         """Determine quantization flag for vLLM based on config and GPU capability."""
-        if not self.quantization:
+        if not self.cfg.quantization:
             return ""
 
-        quantization_strategy = self.quantization.strip().lower()
+        quantization_strategy = self.cfg.quantization.strip().lower()
         if quantization_strategy != "auto":
-            return f"--quantization {self.quantization}"
+            return f"--quantization {self.cfg.quantization}"
 
         logger.info("Auto-detecting quantization strategy based on GPU capability")
         if gpu_name:
@@ -264,7 +648,7 @@ class RemoteVLLMManager:
             logger.warning("Unable to detect GPU name for FP8 check")
             return ""
 
-        if not any(token in gpu_name for token in self.FP8_CAPABLE_GPU_FAMILIES):
+        if not self._FP8_RE.search(gpu_name):
             logger.info("FP8 disabled: %s not in known FP8-capable families", gpu_name)
             return ""
 
@@ -281,19 +665,158 @@ class RemoteVLLMManager:
         logger.info("Compute capability %.1f does not support fp8; skipping quantization", cap_value)
         return ""
 
-    def _build_vllm_start_command(self, quant_flag: str, tensor_parallel_flag: str) -> str:
-        """Build the vLLM startup command."""
-        return (
+    def _compile_templates(self):
+        """
+        Build the vLLM command template, bootstrap script and registration body once
+        
+        The bootstrap script does the whole bring-up on the instance in one
+        round trip: permission fix, already-serving check, GPU query, vLLM
+        check, killing an old server, picking the quantization flag and
+        launching vLLM. It only depends on configuration, so it is identical
+        across retries.
+        """
+        self._start_cmd_tpl = string.Template(
             "python3 -m vllm.entrypoints.openai.api_server "
-            f"--model {self.vllm_model} "
+            "--model $model "
             "--dtype auto "
-            f"--port {self.inference_port} "
+            f"--port {self.cfg.inference_port} "
             "--host 0.0.0.0 "
-            f"{quant_flag} "
-            f"{tensor_parallel_flag} "
-            f"--gpu-memory-utilization {self.vllm_gpu_memory_util} "
-            f"--max-num-seqs {self.vllm_max_num_seqs} "
-            f"--max-model-len {self.vllm_max_model_len}"
+            "$quant_flag "
+            "$tensor_parallel_flag "
+            f"--gpu-memory-utilization {self.cfg.vllm_gpu_memory_util} "
+            f"--max-num-seqs {self.cfg.vllm_max_num_seqs} "
+            f"--max-model-len {self.cfg.vllm_max_model_len}"
+        )
+
+        if self.cfg.quantization.strip().lower() == "auto":
+            # Same rule as _determine_quantization_flag, evaluated remotely
+            families = "|".join(self.FP8_CAPABLE_GPU_FAMILIES)
+            quant_block = (
+                'QUANT_FLAG=""\n'
+                f'if echo "$GPU_NAME" | grep -qE \'{families}\' && '
+                'awk -v cap="$COMPUTE_CAP" \'BEGIN { exit !(cap + 0 >= 8.9) }\'; then\n'
+                '  QUANT_FLAG="--quantization fp8"\n'
+                'fi'
+            )
+        else:
+            quant_block = f"QUANT_FLAG={shlex.quote(self._determine_quantization_flag('', ''))}"
+
+        if self.cfg.hardware_count > 1:
+            tensor_parallel_flag = f"--tensor-parallel-size {self.cfg.hardware_count}"
+        else:
+            tensor_parallel_flag = ""
+
+        pid_path = shlex.quote(self.cfg.vllm_pid_path)
+        log_path = shlex.quote(self.cfg.vllm_log_path)
+
+        # Blocks on the instance until vLLM answers locally, the process
+        # dies or the startup timeout passes, streaming the vLLM log as it
+        # goes. Status lines start with @@ on a fresh line so a partial log
+        # line can't swallow them; the last one is the outcome.
+        self._wait_script = f"""status() {{ printf '\\n@@%s\\n' "$*"; }}
+PID=$(cat {pid_path} 2>/dev/null)
+tail -n +1 -F --pid=$$ {log_path} 2>/dev/null &
+SECONDS=0
+NEXT_HEARTBEAT=60
+until curl -sf -o /dev/null http://localhost:{self.cfg.inference_port}{self.cfg.vllm_models_endpoint}; do
+  if [ -z "$PID" ] || ! kill -0 "$PID" 2>/dev/null; then status DIED; exit 1; fi
+  if [ $SECONDS -ge {self.cfg.vllm_startup_timeout} ]; then status TIMEOUT; exit 124; fi
+  if [ $SECONDS -ge $NEXT_HEARTBEAT ]; then status WAITING $SECONDS; NEXT_HEARTBEAT=$((SECONDS + 60)); fi
+  sleep {self.cfg.vllm_poll_interval:g}
+done
+status READY
+"""
+
+        # Shell variables are escaped as $$; config values are quoted and
+        # passed as template fields so a $ in them is never re-expanded
+        self._startup_script = string.Template(f"""#!/bin/bash
+export PATH=/usr/local/bin:/usr/bin:/bin
+chmod 600 /root/.ssh/authorized_keys 2>/dev/null && chmod 700 /root/.ssh 2>/dev/null && echo "PERMISSIONS_FIXED"
+# A previous run may have left vLLM serving our model; the port is only
+# reachable from inside the instance, so ask it here
+if curl -sf --max-time 5 $models_url 2>/dev/null | python3 -c 'import json, sys; sys.exit(not any(m.get("id") == sys.argv[1] for m in json.load(sys.stdin).get("data", [])))' $model 2>/dev/null; then
+  echo "ALREADY_SERVING"
+  exit 0
+fi
+GPU_INFO=$${{GPU_INFO:-$$(nvidia-smi --query-gpu=name,compute_cap --format=csv,noheader 2>/dev/null | head -n1)}}
+if [ -z "$$GPU_INFO" ]; then
+  echo "nvidia-smi reported no GPU" >&2
+  exit 10
+fi
+GPU_NAME="$${{GPU_INFO%%,*}}"
+COMPUTE_CAP="$${{GPU_INFO##*, }}"
+echo "GPU_INFO $$GPU_NAME|$$COMPUTE_CAP"
+if ! python3 -c 'import importlib.util as u, sys; sys.exit(u.find_spec("vllm") is None)'; then
+  echo "vllm is not importable by python3" >&2
+  exit 11
+fi
+# Give a killed server a moment to release the port
+pkill -f 'vllm[.]entrypoints' && sleep 2
+$quant_block
+echo "QUANT $${{QUANT_FLAG:-none}}"
+echo "Starting vLLM at $$(date)" > $startup_log
+echo "Purpose: PoC sprint computation" >> $startup_log
+echo Model: $model >> $startup_log
+echo "GPU: $$GPU_NAME (Compute $$COMPUTE_CAP)" >> $startup_log
+echo "Hardware count: {self.cfg.hardware_count} GPUs" >> $startup_log
+echo "Quantization: $${{QUANT_FLAG:-none}}" >> $startup_log
+# Own session, so the PID file names a process group covering TP workers
+setsid $start_command > $log_path 2>&1 &
+VLLM_PID=$$!
+echo $$VLLM_PID > $pid_path
+echo "vLLM launched with PID $$VLLM_PID" >> $startup_log
+sleep 3
+if kill -0 $$VLLM_PID 2>/dev/null; then
+  echo "✅ vLLM process is running" >> $startup_log
+else
+  echo "❌ vLLM process died immediately" >> $startup_log
+  tail -50 $log_path >> $startup_log
+  exit 1
+fi
+""").substitute(
+            model=shlex.quote(self.vllm_model),
+            models_url=shlex.quote(f"http://localhost:{self.cfg.inference_port}{self.cfg.vllm_models_endpoint}"),
+            startup_log=shlex.quote(self.cfg.vllm_startup_log_path),
+            log_path=log_path,
+            pid_path=pid_path,
+            quant_block=quant_block,
+            start_command=self._build_vllm_start_command("$QUANT_FLAG", tensor_parallel_flag),
+        )
+
+        # Registration body minus the per-instance id and host
+        model_args = []
+        if self.cfg.quantization and self.cfg.quantization.lower() != "auto":
+            model_args = ["--quantization", self.cfg.quantization]
+        self._register_payload = {
+            "inference_port": self.cfg.inference_port,
+            "inference_segment": self.cfg.inference_segment,
+            "poc_port": self.cfg.poc_port,
+            "poc_segment": self.cfg.poc_segment,
+            "max_concurrent": 100,
+            "models": {
+                self.vllm_model: {
+                    "args": model_args
+                    + [
+                        "--gpu-memory-utilization",
+                        str(self.cfg.vllm_gpu_memory_util),
+                        "--max-num-seqs",
+                        str(self.cfg.vllm_max_num_seqs),
+                        "--max-model-len",
+                        str(self.cfg.vllm_max_model_len),
+                    ]
+                }
+            },
+            "hardware": [
+                {"type": self.cfg.hardware_type, "count": self.cfg.hardware_count}
+            ]
+        }
+
+    def _build_vllm_start_command(self, quant_flag: str, tensor_parallel_flag: str) -> str:
+        """Build the vLLM startup command."""
+        return self._start_cmd_tpl.substitute(
+            model=shlex.quote(self.vllm_model),
+            quant_flag=quant_flag,
+            tensor_parallel_flag=tensor_parallel_flag,
         )
     
     def start_remote_vllm(self, ssh_info: Dict, instance_id: int) -> Optional[str]:
@@ -303,158 +826,141 @@ class RemoteVLLMManager:
         Returns:
             vLLM endpoint URL if successful
         """
-        logger.info(f"Starting vLLM on remote GPU...")
+        logger.info("Starting vLLM on remote GPU...")
         
         # Step 0: Wait for SSH to be ready
         logger.info("Step 0: Waiting for SSH to be ready...")
-        if not self.wait_for_ssh_ready(ssh_info, max_wait=self.ssh_ready_timeout):
+        if not self.wait_for_ssh_ready(ssh_info, max_wait=self.cfg.ssh_ready_timeout):
             logger.error("SSH failed to be ready")
             return None
         
-        # Step 1: Check GPU and system
-        logger.info("Step 1: Checking system...")
-        
-        # Fix SSH permissions if needed
-        fix_cmd = "chmod 600 /root/.ssh/authorized_keys && chmod 700 /root/.ssh && echo 'Permissions fixed'"
-        exit_code, stdout, stderr = self.ssh_execute(ssh_info, fix_cmd, timeout=30)
-        if exit_code == 0:
-            logger.info("✅ Fixed SSH permissions")
-        
-        # Check GPU
+        # Steps 1-2: the bootstrap script checks the system and launches vLLM
+        # in a single round trip, reporting what it found on stdout
+        logger.info("Step 1: Checking system and starting vLLM server...")
+        if self.cfg.hardware_count > 1:
+            logger.info("Using tensor parallelism across %s GPUs", self.cfg.hardware_count)
+        else:
+            logger.info("Using single GPU (no tensor parallelism)")
+
+        # The script travels on the exec channel's stdin and is saved to disk
+        # (for re-running by hand) in the same round trip that runs it
+        script_path = shlex.quote(self.cfg.vllm_startup_script_path)
+        env = ""
+        if instance_id in self._gpu_info:
+            env = f"env GPU_INFO={shlex.quote(self._gpu_info[instance_id])} "
         exit_code, stdout, stderr = self.ssh_execute(
             ssh_info,
-            "nvidia-smi --query-gpu=name,compute_cap --format=csv,noheader | head -n1",
-            timeout=30,
+            f"cat > {script_path} && chmod 755 {script_path} && exec {env}bash {script_path}",
+            timeout=60,
+            stdin=self._startup_script
         )
-        if exit_code != 0:
-            logger.error(f"No GPU found: {stderr}")
-            return None
-        
-        gpu_fields = [field.strip() for field in stdout.strip().split(",")]
-        gpu_name = gpu_fields[0] if gpu_fields else "Unknown"
-        compute_cap = gpu_fields[1] if len(gpu_fields) > 1 else "0.0"
-        logger.info("✅ GPU detected: %s (Compute %s)", gpu_name, compute_cap)
 
-        # Step 2: Start vLLM server
-        logger.info("Step 2: Starting vLLM server...")
+        gpu_name, compute_cap, quant_label = "", "", ""
+        already_serving = False
+        for line in stdout.splitlines():
+            if line == "PERMISSIONS_FIXED":
+                logger.info("✅ Fixed SSH permissions")
+            elif line == "ALREADY_SERVING":
+                already_serving = True
+            elif line.startswith("GPU_INFO "):
+                gpu_name, _, compute_cap = line[len("GPU_INFO "):].partition("|")
+                self._gpu_info[instance_id] = f"{gpu_name}, {compute_cap}"
+                logger.info("✅ GPU detected: %s (Compute %s)", gpu_name, compute_cap)
+            elif line.startswith("QUANT "):
+                quant_label = line[len("QUANT "):]
 
-        # First, kill any existing vLLM processes
-        self.ssh_execute(ssh_info, "pkill -f vllm.entrypoints || true", timeout=10)
-
-        quant_flag = self._determine_quantization_flag(gpu_name, compute_cap)
-        if self.hardware_count > 1:
-            tensor_parallel_flag = f"--tensor-parallel-size {self.hardware_count}"
-            logger.info("Using tensor parallelism across %s GPUs", self.hardware_count)
-        else:
-            tensor_parallel_flag = ""
-            logger.info("Using single GPU (no tensor parallelism)")
-        start_command = self._build_vllm_start_command(quant_flag, tensor_parallel_flag)
+        if exit_code == 0 and already_serving:
+            logger.info("✅ vLLM is already serving %s; skipping startup", self.vllm_model)
+            return ssh_info['host']
+        if exit_code == 10:
+            logger.error("No GPU found: %s", stderr)
+            return None
+        if exit_code == 11:
+            logger.error("vLLM is not importable by python3 on the instance: %s", stderr)
+            return None
 
-        startup_script = f"""#!/bin/bash
-export PATH=/usr/local/bin:/usr/bin:/bin
-echo "Starting vLLM at $(date)" > {self.vllm_startup_log_path}
-echo "Purpose: PoC sprint computation" >> {self.vllm_startup_log_path}
-echo "Model: {self.vllm_model}" >> {self.vllm_startup_log_path}
-echo "GPU: {gpu_name} (Compute {compute_cap})" >> {self.vllm_startup_log_path}
-echo "Hardware count: {self.hardware_count} GPUs" >> {self.vllm_startup_log_path}
-echo "Quantization: {quant_flag or 'none'}" >> {self.vllm_startup_log_path}
-{start_command} > {self.vllm_log_path} 2>&1 &
-VLLM_PID=$!
-echo $VLLM_PID > {self.vllm_pid_path}
-echo "vLLM launched with PID $VLLM_PID" >> {self.vllm_startup_log_path}
-sleep 3
-if kill -0 $VLLM_PID 2>/dev/null; then
-  echo "✅ vLLM process is running" >> {self.vllm_startup_log_path}
-else
-  echo "❌ vLLM process died immediately" >> {self.vllm_startup_log_path}
-  tail -50 {self.vllm_log_path} >> {self.vllm_startup_log_path}
-  exit 1
-fi
-"""
+        if quant_label:
+            # Log the same reasoning the script applied remotely
+            self._determine_quantization_flag(gpu_name, compute_cap)
+            logger.info("Quantization: %s", quant_label)
 
-        exit_code, stdout, stderr = self.ssh_execute(ssh_info, startup_script, timeout=30)
         if exit_code != 0:
             logger.error("Failed to start vLLM: %s", stderr)
-            logger.error("vLLM startup logs:\n%s", self._tail_remote_log(ssh_info, self.vllm_startup_log_path, lines=200))
-            logger.error("vLLM error logs:\n%s", self._tail_remote_log(ssh_info, self.vllm_log_path, lines=200))
+            logs = self._tail_remote_logs(ssh_info, [self.cfg.vllm_startup_log_path, self.cfg.vllm_log_path])
+            logger.error("vLLM startup logs:\n%s", logs[self.cfg.vllm_startup_log_path])
+            logger.error("vLLM error logs:\n%s", logs[self.cfg.vllm_log_path])
             return None
 
         logger.info("✅ vLLM startup initiated")
 
         # Step 3: Wait for vLLM to be ready
         logger.info("Step 3: Waiting for vLLM to start...")
-        poll_interval = 5
-        max_attempts = max(1, self.vllm_startup_timeout // poll_interval)
-        vllm_ready = False
-        startup_start = time.time()
-        consecutive_failures = 0
-        last_log_line = ""
+        # One long-running exec polls on the instance itself and streams the
+        # vLLM log back; progress is summarised once per heartbeat
+        outcome = None
+        fatal_line = ""
+        progress_line = ""
+        last_progress_line = ""
+        stderr = bytearray()
+        lines = self._exec_lines(
+            ssh_info, self._wait_script, timeout=self.cfg.vllm_startup_timeout + 60, stderr=stderr
+        )
+        try:
+            for line in lines:
+                if not line.startswith("@@"):
+                    if self._FATAL_RE.search(line):
+                        outcome, fatal_line = "FATAL", line
+                        break
+                    if self._PROGRESS_RE.search(line):
+                        progress_line = line
+                    continue
 
-        for i in range(max_attempts):
-            time.sleep(poll_interval)
+                line = line[2:]
+                if line.startswith("WAITING "):
+                    elapsed = int(line.split()[1])
+                    remaining = max(0, (self.cfg.vllm_startup_timeout - elapsed) // 60)
+                    logger.info("Waiting for vLLM... (%ss elapsed, ~%sm remaining)", elapsed, remaining)
 
-            exit_code, stdout, stderr = self.ssh_execute(
-                ssh_info,
-                "ps aux | grep 'python3 -m vllm.entrypoints' | grep -v grep",
-                timeout=10,
-            )
+                    if progress_line and progress_line != last_progress_line:
+                        last_progress_line = progress_line
+                        logger.info("📋 Progress: %s", progress_line.strip()[-200:])
 
-            if exit_code == 0 and "python3 -m vllm.entrypoints" in stdout:
-                consecutive_failures = 0
-                exit_code, stdout, stderr = self.ssh_execute(
-                    ssh_info,
-                    f"curl -s -f http://localhost:{self.inference_port}{self.vllm_models_endpoint} || "
-                    f"curl -s -f http://localhost:{self.inference_port}{self.vllm_health_endpoint} || "
-                    "echo 'API not ready'",
-                    timeout=10,
-                )
-                if exit_code == 0 and "API not ready" not in stdout:
-                    logger.info("✅ vLLM API is responding!")
-                    vllm_ready = True
-                    break
-            else:
-                consecutive_failures += 1
-                logger.warning(
-                    "⚠️  vLLM process not found (attempt %s/5)",
-                    consecutive_failures,
-                )
-                if consecutive_failures >= 5:
-                    logger.error("❌ vLLM process died during startup")
-                    logger.error(
-                        "vLLM error logs:\n%s",
-                        self._tail_remote_log(ssh_info, self.vllm_log_path, lines=200),
-                    )
-                    startup_logs = self._tail_remote_log(
-                        ssh_info,
-                        self.vllm_startup_log_path,
-                        lines=200,
-                    )
-                    if startup_logs:
-                        logger.error("vLLM startup logs:\n%s", startup_logs)
-                    return None
-
-            if i % 12 == 0:
-                elapsed = int(time.time() - startup_start)
-                remaining = max(0, (self.vllm_startup_timeout - elapsed) // 60)
-                logger.info("Waiting for vLLM... (%ss elapsed, ~%sm remaining)", elapsed, remaining)
-
-                recent_logs = self._tail_remote_log(ssh_info, self.vllm_log_path, lines=3)
-                if recent_logs and recent_logs != last_log_line:
-                    last_log_line = recent_logs
-                    if any(word in recent_logs.lower() for word in ["download", "load", "init", "start", "model"]):
-                        logger.info("📋 Progress: %s", recent_logs.strip()[-200:])
+                    if elapsed > self.cfg.vllm_model_download_timeout:
+                        logger.warning(
+                            "vLLM still starting after %ss; model download may be slow.",
+                            self.cfg.vllm_model_download_timeout,
+                        )
+                elif line in ("READY", "DIED", "TIMEOUT"):
+                    outcome = line
+        except Exception as e:
+            logger.error("Lost the vLLM wait session: %s", e)
+        finally:
+            # Closes the channel, which also ends the remote wait loop
+            lines.close()
 
-                if elapsed > self.vllm_model_download_timeout:
-                    logger.warning(
-                        "vLLM still starting after %ss; model download may be slow.",
-                        self.vllm_model_download_timeout,
-                    )
+        vllm_ready = outcome == "READY"
+        if vllm_ready:
+            logger.info("✅ vLLM API is responding!")
+        elif outcome in ("DIED", "FATAL"):
+            if outcome == "FATAL":
+                logger.error("❌ vLLM hit a fatal error during startup: %s", fatal_line.strip()[-300:])
+            else:
+                logger.error("❌ vLLM process died during startup")
+            logs = self._tail_remote_logs(ssh_info, [self.cfg.vllm_log_path, self.cfg.vllm_startup_log_path])
+            logger.error("vLLM error logs:\n%s", logs[self.cfg.vllm_log_path])
+            startup_logs = logs[self.cfg.vllm_startup_log_path]
+            if startup_logs:
+                logger.error("vLLM startup logs:\n%s", startup_logs)
+            return None
+        elif stderr:
+            logger.debug("vLLM wait stderr: %s", stderr.decode('utf-8', 'replace').strip())
 
         if not vllm_ready:
             logger.error("vLLM failed to start in time")
 
-            logger.error("vLLM error logs:\n%s", self._tail_remote_log(ssh_info, self.vllm_log_path, lines=200))
-            startup_logs = self._tail_remote_log(ssh_info, self.vllm_startup_log_path, lines=300)
+            logs = self._tail_remote_logs(ssh_info, [self.cfg.vllm_log_path, self.cfg.vllm_startup_log_path], lines=300)
+            logger.error("vLLM error logs:\n%s", logs[self.cfg.vllm_log_path])
+            startup_logs = logs[self.cfg.vllm_startup_log_path]
             if startup_logs:
                 logger.error("vLLM startup logs:\n%s", startup_logs)
             else:
@@ -464,10 +970,39 @@ fi
         
         # Return the SSH gateway URL
         vllm_host = ssh_info['host']
-        logger.info(f"✅ vLLM is ready at {vllm_host}:{self.inference_port}")
+        logger.info("✅ vLLM is ready at %s:%s", vllm_host, self.cfg.inference_port)
         
         return vllm_host
     
+    async def start_remote_vllm_many(
+        self,
+        instances: Dict[int, Dict],
+        concurrency: int = 4
+    ) -> Dict[int, Optional[str]]:
+        """
+        Wait for SSH and start vLLM on several instances concurrently
+        
+        Each instance runs the blocking start_remote_vllm in a worker
+        thread; connections are cached per host, so they don't interfere.
+        
+        Args:
+            instances: SSH connection details keyed by Vast.ai instance ID
+            concurrency: Maximum number of instances brought up at once
+        
+        Returns:
+            The vLLM host, or None on failure, keyed by instance ID
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bring_up(instance_id: int, ssh_info: Dict) -> Optional[str]:
+            async with semaphore:
+                return await asyncio.to_thread(self.start_remote_vllm, ssh_info, instance_id)
+
+        results = await asyncio.gather(
+            *(bring_up(instance_id, ssh_info) for instance_id, ssh_info in instances.items())
+        )
+        return dict(zip(instances, results))
+    
     def register_remote_mlnode(self, vllm_host: str, instance_id: int) -> bool:
         """
         Register remote vLLM as MLNode with Network Node
@@ -479,46 +1014,17 @@ fi
         Returns:
             True if successful
         """
-        logger.info(f"Registering remote vLLM as MLNode...")
+        logger.info("Registering remote vLLM as MLNode...")
         
         node_id = f"vastai-{instance_id}"
-        
-        model_args = []
-        if self.quantization and self.quantization.lower() != "auto":
-            model_args = ["--quantization", self.quantization]
-
-        payload = {
-            "id": node_id,
-            "host": vllm_host,
-            "inference_port": self.inference_port,
-            "inference_segment": self.inference_segment,
-            "poc_port": self.poc_port,
-            "poc_segment": self.poc_segment,
-            "max_concurrent": 100,
-            "models": {
-                self.vllm_model: {
-                    "args": model_args
-                    + [
-                        "--gpu-memory-utilization",
-                        str(self.vllm_gpu_memory_util),
-                        "--max-num-seqs",
-                        str(self.vllm_max_num_seqs),
-                        "--max-model-len",
-                        str(self.vllm_max_model_len),
-                    ]
-                }
-            },
-            "hardware": [
-                {"type": self.hardware_type, "count": self.hardware_count}
-            ]
-        }
+        payload = {"id": node_id, "host": vllm_host, **self._register_payload}
         
         try:
-            logger.info(f"Sending registration payload: {json.dumps(payload, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending registration payload: %s", json.dumps(payload))
             
-            response = requests.post(
-                f"{self.admin_api_url}/admin/v1/nodes",
-                headers={"Content-Type": "application/json"},
+            response = self.admin_session.post(
+                f"{self.cfg.admin_api_url}/admin/v1/nodes",
                 json=payload,
                 timeout=30
             )
@@ -526,37 +1032,39 @@ fi
             response.raise_for_status()
             
             result = response.json()
-            logger.info(f"✅ Remote MLNode registered: {node_id}")
-            logger.info(f"Response: {result}")
+            logger.info("✅ Remote MLNode registered: %s", node_id)
+            logger.info("Response: %s", result)
             return True
         
         except requests.RequestException as e:
-            logger.error(f"Failed to register remote MLNode: {e}")
+            logger.error("Failed to register remote MLNode: %s", e)
             if hasattr(e, 'response') and e.response:
-                logger.error(f"Response: {e.response.text}")
+                logger.error("Response: %s", e.response.text)
             return False
     
     def unregister_remote_mlnode(self, instance_id: int) -> bool:
         """Unregister remote MLNode from Network Node"""
         node_id = f"vastai-{instance_id}"
-        logger.info(f"Unregistering remote MLNode {node_id}...")
+        logger.info("Unregistering remote MLNode %s...", node_id)
         
         try:
-            response = requests.delete(
-                f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            # Only the status code matters; don't buffer the body
+            with self.admin_session.delete(
+                f"{self.cfg.admin_api_url}/admin/v1/nodes/{node_id}",
+                timeout=30,
+                stream=True
+            ) as response:
+                status_code = response.status_code
             
-            if response.status_code == 200:
-                logger.info(f"✅ MLNode {node_id} unregistered")
+            if status_code == 200:
+                logger.info("✅ MLNode %s unregistered", node_id)
                 return True
             else:
-                logger.warning(f"Unregister returned: {response.status_code}")
+                logger.warning("Unregister returned: %s", status_code)
                 return False
         
         except Exception as e:
-            logger.error(f"Failed to unregister: {e}")
+            logger.error("Failed to unregister: %s", e)
             return False
     
     def check_vllm_status(self, ssh_info: Dict) -> Dict:
@@ -569,39 +1077,37 @@ fi
         }
         
         try:
+            # All four probes run concurrently on channels of one connection;
+            # the GPU and API probes answer through their exit codes alone
+            gpu, process, api, logs = self.ssh_execute_many(
+                ssh_info,
+                [
+                    "exec nvidia-smi -L",
+                    f'PID=$(cat {shlex.quote(self.cfg.vllm_pid_path)} 2>/dev/null); '
+                    '[ -n "$PID" ] && [ -d /proc/$PID ] && echo RUNNING || echo NOT_RUNNING',
+                    f"exec curl -sf -o /dev/null http://localhost:{self.cfg.inference_port}{self.cfg.vllm_health_endpoint}",
+                    f"tail -20 {shlex.quote(self.cfg.vllm_log_path)} 2>/dev/null || echo 'No logs'",
+                ],
+                timeout=30,
+            )
+            
             # Check GPU
-            exit_code, stdout, stderr = self.ssh_execute(ssh_info, "nvidia-smi", timeout=30)
-            if exit_code == 0:
+            if gpu[0] == 0:
                 status["gpu_available"] = True
             
             # Check vLLM process
-            exit_code, stdout, stderr = self.ssh_execute(
-                ssh_info, 
-                "ps aux | grep vllm.entrypoints | grep -v grep",
-                timeout=10
-            )
-            if exit_code == 0 and "python3 -m vllm.entrypoints" in stdout:
+            if process[0] == 0 and process[1].strip() == "RUNNING":
                 status["vllm_running"] = True
             
             # Check vLLM API
-            exit_code, stdout, stderr = self.ssh_execute(
-                ssh_info,
-                f"curl -s http://localhost:{self.inference_port}{self.vllm_health_endpoint} || echo 'Not healthy'",
-                timeout=10
-            )
-            if exit_code == 0 and "Not healthy" not in stdout:
+            if api[0] == 0:
                 status["vllm_responding"] = True
             
             # Get recent logs
-            exit_code, stdout, stderr = self.ssh_execute(
-                ssh_info,
-                f"tail -20 {self.vllm_log_path} 2>/dev/null || echo 'No logs'",
-                timeout=10
-            )
-            status["logs"] = stdout.strip()
+            status["logs"] = logs[1].strip()
             
         except Exception as e:
-            logger.error(f"Error checking vLLM status: {e}")
+            logger.error("Error checking vLLM status: %s", e)
         
         return status
     
@@ -610,16 +1116,83 @@ fi
         logger.info("Stopping remote vLLM...")
         
         try:
-            # Kill vLLM process
-            self.ssh_execute(ssh_info, "pkill -f vllm.entrypoints", timeout=10)
-            self.ssh_execute(ssh_info, "pkill -f start_vllm.sh", timeout=10)
-            
-            # Clean up PID file
-            self.ssh_execute(ssh_info, f"rm -f {self.vllm_pid_path}", timeout=5)
+            # Signal the process group from the PID file instead of scanning
+            # the process table; escalate to SIGKILL if it hasn't exited in 10s.
+            # A missing or stale PID file (server started by hand, or the file
+            # was lost) falls back to matching the command line.
+            pid_path = shlex.quote(self.cfg.vllm_pid_path)
+            exit_code, _, stderr = self.ssh_execute(
+                ssh_info,
+                f'pid=$(cat {pid_path} 2>/dev/null); '
+                'if [ -n "$pid" ] && kill -0 "$pid" 2>/dev/null; then '
+                'kill -TERM -- "-$pid" 2>/dev/null; '
+                'for i in $(seq 20); do kill -0 "$pid" 2>/dev/null || break; sleep 0.5; done; '
+                'kill -KILL -- "-$pid" 2>/dev/null; '
+                'else '
+                "pkill -TERM -f 'vllm[.]entrypoints'; "
+                "for i in $(seq 20); do pgrep -f 'vllm[.]entrypoints' >/dev/null || break; sleep 0.5; done; "
+                "pkill -KILL -f 'vllm[.]entrypoints'; "
+                f'fi; rm -f {pid_path}',
+                timeout=20
+            )
             
-            logger.info("✅ vLLM stopped")
+            if exit_code == 0:
+                logger.info("✅ vLLM stopped")
+            else:
+                logger.warning("Error stopping vLLM: %s", stderr)
         except Exception as e:
-            logger.warning(f"Error stopping vLLM: {e}")
+            logger.warning("Error stopping vLLM: %s", e)
+        finally:
+            self.close(ssh_info)
+    
+    def _get_nodes_cached(self, nodes_url: str, max_age: float = 5.0) -> Optional[Dict[str, Dict]]:
+        """
+        Return the admin node list keyed by node id, refreshed at most every max_age seconds
+        
+        Stale entries are revalidated with If-None-Match, so an unchanged list
+        comes back as an empty 304. Callers arriving during a refresh wait for
+        it instead of issuing their own request.
+        """
+        with self._nodes_cache_lock:
+            entry = self._nodes_cache.get(nodes_url)
+            if entry is not None and time.monotonic() - entry['ts'] < max_age:
+                return entry['nodes']
+            
+            headers = {}
+            if entry is not None and entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            
+            with self.admin_session.get(nodes_url, headers=headers, stream=True, timeout=10) as response:
+                if response.status_code == 304 and entry is not None:
+                    entry['ts'] = time.monotonic()
+                    return entry['nodes']
+                if response.status_code != 200:
+                    return None
+                
+                if ijson is None:
+                    items = response.json()
+                else:
+                    # Build the index while parsing instead of holding the
+                    # decoded list and the index at the same time
+                    response.raw.decode_content = True
+                    items = ijson.items(response.raw, 'item')
+                
+                nodes = {}
+                for node_data in items:
+                    # Entries for nodes that are still registering may carry
+                    # null fields; skip anything that isn't a usable object
+                    if not isinstance(node_data, dict):
+                        continue
+                    node_id = (node_data.get('node') or {}).get('id')
+                    if node_id is not None:
+                        nodes[node_id] = node_data
+                
+                self._nodes_cache[nodes_url] = {
+                    'ts': time.monotonic(),
+                    'etag': response.headers.get('ETag'),
+                    'nodes': nodes,
+                }
+                return nodes
     
     def wait_for_poc_completion(self, instance_id: int, timeout: int = 900) -> bool:
         """
@@ -628,44 +1201,45 @@ fi
         Returns:
             True if PoC completed successfully
         """
-        logger.info(f"Monitoring PoC progress for instance {instance_id}...")
+        logger.info("Monitoring PoC progress for instance %s...", instance_id)
         
-        start_time = time.time()
+        start_time = time.monotonic()
         check_count = 0
         node_id = f"vastai-{instance_id}"
+        nodes_url = f"{self.cfg.admin_api_url}/admin/v1/nodes"
+        last_status = None
+        # Short PoCs finish early, so poll quickly at first and slow down
+        # towards 30s while the sprint is still running
+        poll_interval = 5.0
         
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
             check_count += 1
             try:
                 # Check MLNode status
-                response = requests.get(
-                    f"{self.admin_api_url}/admin/v1/nodes",
-                    timeout=10
-                )
+                nodes = self._get_nodes_cached(nodes_url)
+                node_data = nodes.get(node_id) if nodes is not None else None
                 
-                if response.status_code == 200:
-                    nodes = response.json()
+                if node_data is not None:
+                    state = node_data.get('state') or {}
+                    poc_status = state.get('poc_current_status') or 'UNKNOWN'
+                    
+                    if poc_status != last_status:
+                        logger.info("PoC Status for %s: %s", node_id, poc_status)
+                        last_status = poc_status
                     
-                    for node_data in nodes:
-                        node_info = node_data.get('node', {})
-                        if node_info.get('id') == node_id:
-                            state = node_data.get('state', {})
-                            poc_status = state.get('poc_current_status', 'UNKNOWN')
-                            
-                            if check_count % 5 == 0:
-                                logger.info(f"PoC Status for {node_id}: {poc_status}")
-                            
-                            if poc_status == 'IDLE':
-                                logger.info("✅ PoC completed!")
-                                return True
+                    if poc_status == 'IDLE':
+                        logger.info("✅ PoC completed!")
+                        return True
             
             except Exception as e:
                 if check_count % 5 == 0:
-                    logger.error(f"Error checking status: {e}")
+                    logger.error("Error checking status: %s", e)
             
-            time.sleep(30)
+            remaining = timeout - (time.monotonic() - start_time)
+            time.sleep(max(0, min(poll_interval, remaining)))
+            poll_interval = min(30.0, poll_interval * 1.3)
         
-        logger.warning(f"PoC monitoring timed out after {timeout}s")
+        logger.warning("PoC monitoring timed out after %ss", timeout)
         return False
 
 
@@ -680,19 +1254,19 @@ def test_manager():
         
         print("✅ Manager initialized")
         print(f"\nConfiguration:")
-        print(f"  Admin API: {manager.admin_api_url}")
-        print(f"  SSH Key: {manager.ssh_key_path}")
+        print(f"  Admin API: {manager.cfg.admin_api_url}")
+        print(f"  SSH Key: {manager.cfg.ssh_key_path}")
         print(f"  Model: {manager.vllm_model}")
         
         # Check SSH key
-        if os.path.exists(manager.ssh_key_path):
+        if os.path.exists(manager.cfg.ssh_key_path):
             print(f"  ✅ SSH key found")
         else:
             print(f"  ❌ SSH key not found")
         
         # Check local MLNode
         try:
-            response = requests.get(f"{manager.admin_api_url}/admin/v1/nodes", timeout=5)
+            response = manager.admin_session.get(f"{manager.cfg.admin_api_url}/admin/v1/nodes", timeout=5)
             if response.status_code == 200:
                 nodes = response.json()
                 print(f"  ✅ Network Node API accessible")
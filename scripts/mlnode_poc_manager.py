@@ -6,14 +6,26 @@ Uses the full MLNode API instead of raw vLLM.
 """
 
 import os
+import sys
 import time
 import json
+import random
 import logging
 import requests
 import paramiko
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict
+from pathlib import Path
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from rate_limiter import vastai_api_limiter
+from ssh_utils import collect_channel, load_private_key
+
 load_dotenv('config/.env')
 
 logging.basicConfig(
@@ -29,6 +41,19 @@ class MLNodePoCManager:
     Uses the official MLNode Docker image with full PoC support.
     """
 
+    # Same key-exchange set as RemoteVLLMManager: curve25519/ECDH first,
+    # group14-sha256 as the only finite-field fallback
+    _DISABLED_ALGORITHMS = {
+        "kex": [
+            "diffie-hellman-group1-sha1",
+            "diffie-hellman-group14-sha1",
+            "diffie-hellman-group-exchange-sha1",
+            "diffie-hellman-group-exchange-sha256",
+            "diffie-hellman-group16-sha512",
+        ],
+        "keys": ["ssh-dss"],
+    }
+
     def __init__(self):
         self.admin_api_url = os.getenv('GONKA_ADMIN_API_URL', 'http://localhost:9200')
         self.ssh_key_path = os.path.expanduser(os.getenv('VASTAI_SSH_KEY_PATH', '~/.ssh/id_rsa'))
@@ -48,6 +73,24 @@ class MLNodePoCManager:
         self.mlnode_startup_timeout = int(os.getenv('MLNODE_STARTUP_TIMEOUT', '1800'))
         self.poc_execution_timeout = int(os.getenv('POC_EXECUTION_TIMEOUT', '900'))
 
+        # Parsed on first use; the key file may be written after start-up
+        self._pkey: Optional[paramiko.PKey] = None
+
+        # Pooled session for polling the MLNode API; polls retry on their own
+        self._http = requests.Session()
+        self._http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+
+        # One pooled session for the whole register/poll/unregister lifecycle
+        self.admin_session = requests.Session()
+        self.admin_session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False)
+        )
+        self.admin_session.mount('http://', adapter)
+        self.admin_session.mount('https://', adapter)
+
         logger.info("MLNode PoC Manager initialized")
         logger.info("PoC model: %s", self.poc_model)
         logger.info("MLNode port: %s", self.mlnode_port)
@@ -57,7 +100,7 @@ class MLNodePoCManager:
     def get_ssh_connection(self, vastai_manager, instance_id: int) -> Optional[Dict]:
         """Get connection details from Vast.ai instance"""
         try:
-            time.sleep(1)  # Rate limiting
+            vastai_api_limiter.acquire()
 
             response = vastai_manager.get_instance_status(instance_id)
             if not response:
@@ -79,28 +122,28 @@ class MLNodePoCManager:
 
             # Log all fields containing "port" in the name
             port_fields = {k: v for k, v in status.items() if 'port' in k.lower()}
-            logger.info(f"DEBUG - Port-related fields ({len(port_fields)}):")
+            logger.info("DEBUG - Port-related fields (%s):", len(port_fields))
             for key, value in port_fields.items():
-                logger.info(f"  {key}: {value}")
+                logger.info("  %s: %s", key, value)
 
             # Check extra_env for port mapping
             extra_env = status.get('extra_env', [])
-            logger.info(f"DEBUG - extra_env: {extra_env}")
+            logger.info("DEBUG - extra_env: %s", extra_env)
 
             # Check for common port mapping fields
             logger.info("DEBUG - Checking specific fields:")
-            logger.info(f"  direct_port_{self.mlnode_port}: {status.get(f'direct_port_{self.mlnode_port}')}")
-            logger.info(f"  direct_port_count: {status.get('direct_port_count')}")
-            logger.info(f"  direct_port_start: {status.get('direct_port_start')}")
-            logger.info(f"  direct_port_end: {status.get('direct_port_end')}")
-            logger.info(f"  ports: {status.get('ports')}")
-            logger.info(f"  port_forwards: {status.get('port_forwards')}")
+            logger.info("  direct_port_%s: %s", self.mlnode_port, status.get(f'direct_port_{self.mlnode_port}'))
+            logger.info("  direct_port_count: %s", status.get('direct_port_count'))
+            logger.info("  direct_port_start: %s", status.get('direct_port_start'))
+            logger.info("  direct_port_end: %s", status.get('direct_port_end'))
+            logger.info("  ports: %s", status.get('ports'))
+            logger.info("  port_forwards: %s", status.get('port_forwards'))
             logger.info("=" * 60)
 
             # Try to get the external port from Vast.ai API fields
             mlnode_port_from_api = status.get(f'direct_port_{self.mlnode_port}')
             if mlnode_port_from_api:
-                logger.info(f"✅ Found external port in API: {mlnode_port_from_api}")
+                logger.info("✅ Found external port in API: %s", mlnode_port_from_api)
 
             # Parse extra_env to find port mappings (it's a list of lists or strings)
             mlnode_port_from_docker_args = None
@@ -113,7 +156,7 @@ class MLNodePoCManager:
                 matches = re.findall(port_pattern, env_str)
                 if matches:
                     mlnode_port_from_docker_args = int(matches[0])
-                    logger.info(f"DEBUG - Found port mapping in extra_env: {mlnode_port_from_docker_args}:8080")
+                    logger.info("DEBUG - Found port mapping in extra_env: %s:8080", mlnode_port_from_docker_args)
 
             # Try to get port from SSH command - query the container's environment
             # Vast.ai sets VAST_TCP_PORT_8080 environment variable in the container's init process
@@ -130,41 +173,35 @@ class MLNodePoCManager:
                         import paramiko
                         ssh = paramiko.SSHClient()
                         ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                        private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-                        ssh.connect(
-                            hostname=ssh_host,
-                            port=ssh_port,
-                            username='root',
-                            pkey=private_key,
-                            timeout=5
-                        )
+                        self._ssh_connect(ssh, ssh_host, ssh_port, 'root', timeout=5)
                         # Read from /proc/1/environ (container's main process environment)
                         # This contains VAST_TCP_PORT_8080=53590 even if it's not in SSH shell
-                        stdin, stdout, stderr = ssh.exec_command(
-                            "cat /proc/1/environ | tr '\\0' '\\n' | grep VAST_TCP_PORT_8080 | cut -d= -f2",
-                            timeout=5
+                        chan = ssh.get_transport().open_session(timeout=5)
+                        chan.exec_command(
+                            "cat /proc/1/environ | tr '\\0' '\\n' | grep VAST_TCP_PORT_8080 | cut -d= -f2"
                         )
-                        port_output = stdout.read().decode().strip()
+                        _, port_output, _ = collect_channel(chan, 5)
+                        port_output = port_output.strip()
                         ssh.close()
 
                         if port_output and port_output.isdigit():
                             mlnode_port_from_ssh = int(port_output)
-                            logger.info(f"✅ Found external port in container: {mlnode_port_from_ssh}")
+                            logger.info("✅ Found external port in container: %s", mlnode_port_from_ssh)
                             break
                         else:
                             if attempt % 12 == 0:  # Log every 60 seconds (12 attempts × 5s)
                                 elapsed = (attempt + 1) * 5
                                 remaining_min = ((max_attempts - attempt - 1) * 5) // 60
-                                logger.info(f"Container not ready yet ({elapsed}s elapsed, ~{remaining_min}m remaining)")
+                                logger.info("Container not ready yet (%ss elapsed, ~%sm remaining)", elapsed, remaining_min)
                     except Exception as e:
                         if attempt < max_attempts - 1:
                             if attempt % 12 == 0:  # Log every 60 seconds
                                 elapsed = (attempt + 1) * 5
                                 remaining_min = ((max_attempts - attempt - 1) * 5) // 60
-                                logger.debug(f"Waiting for container ({elapsed}s elapsed, ~{remaining_min}m remaining)")
+                                logger.debug("Waiting for container (%ss elapsed, ~%sm remaining)", elapsed, remaining_min)
                             time.sleep(5)
                         else:
-                            logger.warning(f"Could not query port via SSH after {max_attempts} attempts ({max_attempts * 5}s / 30 minutes).")
+                            logger.warning("Could not query port via SSH after %s attempts (%ss / 30 minutes).", max_attempts, max_attempts * 5)
                             logger.warning("Container may not have started yet. Will use default port and retry later.")
                             break
 
@@ -183,13 +220,13 @@ class MLNodePoCManager:
                 self.mlnode_port  # Fallback to default (will likely fail but worth trying)
             )
 
-            logger.info(f"DEBUG - Final port selection: {mlnode_port} (API: {mlnode_port_from_api}, SSH tunnel: {mlnode_port_from_ssh_tunnel}, SSH env: {mlnode_port_from_ssh}, Docker args: {mlnode_port_from_docker_args}, Default: {self.mlnode_port})")
+            logger.info("DEBUG - Final port selection: %s (API: %s, SSH tunnel: %s, SSH env: %s, Docker args: %s, Default: %s)", mlnode_port, mlnode_port_from_api, mlnode_port_from_ssh_tunnel, mlnode_port_from_ssh, mlnode_port_from_docker_args, self.mlnode_port)
 
             if not ssh_host:
                 logger.error("SSH host not found in response")
                 return None
 
-            logger.info(f"Instance ports - SSH: {ssh_port}, MLNode API: {mlnode_port} (internal: {self.mlnode_port})")
+            logger.info("Instance ports - SSH: %s, MLNode API: %s (internal: %s)", ssh_port, mlnode_port, self.mlnode_port)
 
             return {
                 'host': ssh_host,
@@ -198,56 +235,76 @@ class MLNodePoCManager:
                 'mlnode_port': int(mlnode_port)
             }
         except Exception as e:
-            logger.error(f"Failed to get connection info: {e}")
+            logger.error("Failed to get connection info: %s", e)
             return None
 
+    def _private_key(self) -> paramiko.PKey:
+        """Return the SSH key, parsing the PEM only once per manager"""
+        if self._pkey is None:
+            self._pkey = load_private_key(self.ssh_key_path)
+            if self._pkey is None:
+                raise FileNotFoundError(f"SSH key not found: {self.ssh_key_path}")
+        return self._pkey
+
+    def _ssh_connect(self, ssh: paramiko.SSHClient, hostname: str, port: int, username: str, **timeouts):
+        """Connect with our key only, skipping the agent probe and ~/.ssh key scan"""
+        ssh.connect(
+            hostname=hostname,
+            port=port,
+            username=username,
+            pkey=self._private_key(),
+            allow_agent=False,
+            look_for_keys=False,
+            disabled_algorithms=self._DISABLED_ALGORITHMS,
+            **timeouts
+        )
+
     def wait_for_ssh_ready(self, ssh_info: Dict, max_wait: int = 900) -> bool:
         """Wait for SSH to be ready on the remote instance"""
-        logger.info(f"Waiting for SSH to be ready at {ssh_info['host']}:{ssh_info['port']}...")
+        logger.info("Waiting for SSH to be ready at %s:%s...", ssh_info['host'], ssh_info['port'])
 
-        start_time = time.time()
+        start_time = time.monotonic()
+        last_log = start_time
         attempt = 0
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
-        while (time.time() - start_time) < max_wait:
+        while (time.monotonic() - start_time) < max_wait:
             attempt += 1
             try:
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-                private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-
-                ssh.connect(
-                    hostname=ssh_info['host'],
-                    port=ssh_info['port'],
-                    username=ssh_info['username'],
-                    pkey=private_key,
-                    timeout=10,
-                    banner_timeout=30
-                )
-
-                stdin, stdout, stderr = ssh.exec_command("echo 'SSH test'", timeout=5)
-                exit_code = stdout.channel.recv_exit_status()
+                self._ssh_connect(ssh, ssh_info['host'], ssh_info['port'], ssh_info['username'], timeout=10, banner_timeout=30)
 
-                ssh.close()
+                chan = ssh.get_transport().open_session(timeout=5)
+                chan.exec_command("echo 'SSH test'")
+                exit_code, _, _ = collect_channel(chan, 5)
 
                 if exit_code == 0:
-                    logger.info(f"✅ SSH is ready (attempt #{attempt})")
+                    logger.info("✅ SSH is ready (attempt #%s)", attempt)
                     return True
 
             except paramiko.ssh_exception.AuthenticationException:
-                if attempt % 6 == 0:
-                    elapsed = int(time.time() - start_time)
-                    logger.info(f"SSH auth not ready yet ({elapsed}s elapsed)... Retrying")
-                time.sleep(5)
+                if time.monotonic() - last_log >= 30:
+                    last_log = time.monotonic()
+                    elapsed = int(last_log - start_time)
+                    logger.info("SSH auth not ready yet (%ss elapsed)... Retrying", elapsed)
 
             except Exception as e:
-                if attempt % 6 == 0:
-                    elapsed = int(time.time() - start_time)
-                    logger.info(f"SSH not ready yet ({elapsed}s elapsed)... Retrying")
-                time.sleep(5)
+                if time.monotonic() - last_log >= 30:
+                    last_log = time.monotonic()
+                    elapsed = int(last_log - start_time)
+                    logger.info("SSH not ready yet (%ss elapsed)... Retrying", elapsed)
+
+            finally:
+                ssh.close()
+
+            # Same schedule as RemoteVLLMManager: 1s doubling to a 15s cap,
+            # plus jitter so parallel waits spread out
+            delay = min(15.0, 1.0 * (2 ** min(attempt - 1, 4))) + random.uniform(0, 0.5)
+            remaining = max_wait - (time.monotonic() - start_time)
+            time.sleep(max(0, min(delay, remaining)))
 
-        elapsed = int(time.time() - start_time)
-        logger.error(f"SSH failed to be ready after {elapsed}s")
+        elapsed = int(time.monotonic() - start_time)
+        logger.error("SSH failed to be ready after %ss", elapsed)
         return False
 
     def ssh_execute(self, ssh_info: Dict, command: str, timeout: int = 300) -> tuple:
@@ -256,27 +313,17 @@ class MLNodePoCManager:
             ssh = paramiko.SSHClient()
             ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
-            private_key = paramiko.RSAKey.from_private_key_file(self.ssh_key_path)
-
-            ssh.connect(
-                hostname=ssh_info['host'],
-                port=ssh_info['port'],
-                username=ssh_info['username'],
-                pkey=private_key,
-                timeout=15,
-                banner_timeout=30
-            )
+            self._ssh_connect(ssh, ssh_info['host'], ssh_info['port'], ssh_info['username'], timeout=15, banner_timeout=30)
 
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-            exit_code = stdout.channel.recv_exit_status()
-            stdout_text = stdout.read().decode('utf-8')
-            stderr_text = stderr.read().decode('utf-8')
+            chan = ssh.get_transport().open_session(timeout=timeout)
+            chan.exec_command(command)
+            result = collect_channel(chan, timeout)
 
             ssh.close()
-            return (exit_code, stdout_text, stderr_text)
+            return result
 
         except Exception as e:
-            logger.error(f"SSH execution failed: {e}")
+            logger.error("SSH execution failed: %s", e)
             return (-1, "", str(e))
 
     def wait_for_mlnode_ready(self, mlnode_url: str, timeout: int = 1800) -> bool:
@@ -290,40 +337,40 @@ class MLNodePoCManager:
         Returns:
             True if MLNode is ready
         """
-        logger.info(f"Waiting for MLNode to be ready at {mlnode_url}...")
+        logger.info("Waiting for MLNode to be ready at %s...", mlnode_url)
 
-        start_time = time.time()
+        start_time = time.monotonic()
         attempt = 0
         health_endpoint = f"{mlnode_url}{self.mlnode_api_segment}/state"
 
-        while (time.time() - start_time) < timeout:
+        while (time.monotonic() - start_time) < timeout:
             attempt += 1
             try:
-                response = requests.get(health_endpoint, timeout=10)
+                response = self._http.get(health_endpoint, timeout=10)
 
                 if response.status_code == 200:
                     state_data = response.json()
                     state = state_data.get('state', 'UNKNOWN')
 
                     if attempt % 6 == 0:
-                        elapsed = int(time.time() - start_time)
-                        logger.info(f"MLNode state: {state} ({elapsed}s elapsed)")
+                        elapsed = int(time.monotonic() - start_time)
+                        logger.info("MLNode state: %s (%ss elapsed)", state, elapsed)
 
                     # MLNode is ready when it's in a stable state
                     if state in ['STOPPED', 'INFERENCE', 'POW']:
-                        logger.info(f"✅ MLNode is ready (state: {state})")
+                        logger.info("✅ MLNode is ready (state: %s)", state)
                         return True
 
             except requests.RequestException:
                 if attempt % 12 == 0:
-                    elapsed = int(time.time() - start_time)
+                    elapsed = int(time.monotonic() - start_time)
                     remaining = max(0, (timeout - elapsed) // 60)
-                    logger.info(f"Waiting for MLNode... ({elapsed}s elapsed, ~{remaining}m remaining)")
+                    logger.info("Waiting for MLNode... (%ss elapsed, ~%sm remaining)", elapsed, remaining)
 
             time.sleep(5)
 
-        elapsed = int(time.time() - start_time)
-        logger.error(f"MLNode failed to be ready after {elapsed}s")
+        elapsed = int(time.monotonic() - start_time)
+        logger.error("MLNode failed to be ready after %ss", elapsed)
         return False
 
     def start_mlnode_container(self, ssh_info: Dict, instance_id: int) -> Optional[str]:
@@ -347,7 +394,7 @@ class MLNodePoCManager:
         mlnode_port = ssh_info.get('mlnode_port', self.mlnode_port)  # Use mapped port
         mlnode_url = f"http://{mlnode_host}:{mlnode_port}"
 
-        logger.info(f"MLNode URL: {mlnode_url}")
+        logger.info("MLNode URL: %s", mlnode_url)
         logger.info("Waiting for MLNode API to become accessible...")
         logger.info("This may take 15-30 minutes for model download and initialization")
 
@@ -356,11 +403,11 @@ class MLNodePoCManager:
         # The container exposes port 5070 internally, but Vast.ai maps it to an external port
         if not self.wait_for_mlnode_ready(mlnode_url, timeout=self.mlnode_startup_timeout):
             logger.error("MLNode failed to start within timeout")
-            logger.error(f"Timeout: {self.mlnode_startup_timeout}s ({self.mlnode_startup_timeout//60} minutes)")
-            logger.error(f"Try checking Vast.ai console for instance {instance_id}")
+            logger.error("Timeout: %ss (%s minutes)", self.mlnode_startup_timeout, self.mlnode_startup_timeout//60)
+            logger.error("Try checking Vast.ai console for instance %s", instance_id)
             return None
 
-        logger.info(f"✅ MLNode is ready at {mlnode_url}")
+        logger.info("✅ MLNode is ready at %s", mlnode_url)
         return mlnode_url
 
     def register_mlnode(self, mlnode_url: str, instance_id: int) -> bool:
@@ -399,87 +446,86 @@ class MLNodePoCManager:
             ]
         }
 
-        logger.info(f"Configuration:")
-        logger.info(f"  Node ID: {node_id}")
-        logger.info(f"  Host: {mlnode_host}")
-        logger.info(f"  Ports: {self.mlnode_port} (inference & PoC)")
-        logger.info(f"  Model: {self.poc_model}")
-        logger.info(f"  Hardware: {self.hardware_count}x {self.hardware_type}")
+        logger.info("Configuration:")
+        logger.info("  Node ID: %s", node_id)
+        logger.info("  Host: %s", mlnode_host)
+        logger.info("  Ports: %s (inference & PoC)", self.mlnode_port)
+        logger.info("  Model: %s", self.poc_model)
+        logger.info("  Hardware: %sx %s", self.hardware_count, self.hardware_type)
 
         try:
-            response = requests.post(
+            response = self.admin_session.post(
                 f"{self.admin_api_url}/admin/v1/nodes",
-                headers={"Content-Type": "application/json"},
                 json=payload,
                 timeout=30
             )
 
             if response.status_code == 200:
-                logger.info(f"✅ Admin API accepted registration (HTTP 200)")
+                logger.info("✅ Admin API accepted registration (HTTP 200)")
 
                 # CRITICAL: Verify registration actually succeeded
                 if self.verify_registration(node_id):
-                    logger.info(f"✅ MLNode registration VERIFIED in Admin API")
+                    logger.info("✅ MLNode registration VERIFIED in Admin API")
                     return True
                 else:
-                    logger.error(f"❌ REGISTRATION FAILED VERIFICATION")
-                    logger.error(f"   MLNode accepted by API but not found in registry")
+                    logger.error("❌ REGISTRATION FAILED VERIFICATION")
+                    logger.error("   MLNode accepted by API but not found in registry")
                     return False
 
             elif response.status_code == 201:
-                logger.info(f"✅ Admin API created registration (HTTP 201)")
+                logger.info("✅ Admin API created registration (HTTP 201)")
 
                 if self.verify_registration(node_id):
-                    logger.info(f"✅ MLNode registration VERIFIED in Admin API")
+                    logger.info("✅ MLNode registration VERIFIED in Admin API")
                     return True
                 else:
-                    logger.error(f"❌ REGISTRATION FAILED VERIFICATION")
+                    logger.error("❌ REGISTRATION FAILED VERIFICATION")
                     return False
 
             elif response.status_code == 404:
-                logger.error(f"❌ FATAL: Admin API endpoint not found (404)")
-                logger.error(f"   Admin API must be at: {self.admin_api_url}/admin/v1/nodes")
-                logger.error(f"   Check if Network Node is running and accessible")
+                logger.error("❌ FATAL: Admin API endpoint not found (404)")
+                logger.error("   Admin API must be at: %s/admin/v1/nodes", self.admin_api_url)
+                logger.error("   Check if Network Node is running and accessible")
                 return False
 
             elif response.status_code == 409:
-                logger.warning(f"⚠️  Node already registered (409 Conflict)")
-                logger.info(f"   Attempting to clean up old registration...")
+                logger.warning("⚠️  Node already registered (409 Conflict)")
+                logger.info("   Attempting to clean up old registration...")
 
                 try:
-                    del_resp = requests.delete(
+                    del_resp = self.admin_session.delete(
                         f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
                         timeout=10
                     )
-                    logger.info(f"   Old registration deleted: HTTP {del_resp.status_code}")
+                    logger.info("   Old registration deleted: HTTP %s", del_resp.status_code)
 
                     # Wait before retry
                     time.sleep(2)
 
                     # Retry registration
-                    logger.info(f"   Retrying registration...")
+                    logger.info("   Retrying registration...")
                     return self.register_mlnode(mlnode_url, instance_id)
 
                 except Exception as e:
-                    logger.error(f"   Failed to clean up: {e}")
+                    logger.error("   Failed to clean up: %s", e)
                     return False
 
             else:
-                logger.error(f"❌ Registration failed: HTTP {response.status_code}")
+                logger.error("❌ Registration failed: HTTP %s", response.status_code)
                 try:
                     error_data = response.json()
-                    logger.error(f"   Error: {error_data.get('error', error_data)}")
+                    logger.error("   Error: %s", error_data.get('error', error_data))
                 except:
-                    logger.error(f"   Response: {response.text[:500]}")
+                    logger.error("   Response: %s", response.text[:500])
                 return False
 
         except requests.Timeout:
-            logger.error(f"❌ FATAL: Registration timeout")
-            logger.error(f"   Admin API at {self.admin_api_url} is not responding")
+            logger.error("❌ FATAL: Registration timeout")
+            logger.error("   Admin API at %s is not responding", self.admin_api_url)
             return False
 
         except Exception as e:
-            logger.error(f"❌ FATAL: Registration exception: {e}", exc_info=True)
+            logger.error("❌ FATAL: Registration exception: %s", e, exc_info=True)
             return False
 
     def verify_registration(self, node_id: str) -> bool:
@@ -493,9 +539,9 @@ class MLNodePoCManager:
             True if found, False otherwise
         """
         try:
-            logger.info(f"Verifying registration: {node_id}...")
+            logger.info("Verifying registration: %s...", node_id)
 
-            response = requests.get(
+            response = self.admin_session.get(
                 f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
                 timeout=10
             )
@@ -505,24 +551,24 @@ class MLNodePoCManager:
                 state = node_data.get('state', {})
                 admin_state = state.get('admin_state', {})
 
-                logger.info(f"   ✅ Found in Admin API")
-                logger.info(f"      Status: {state.get('current_status', 'UNKNOWN')}")
-                logger.info(f"      Epoch: {admin_state.get('epoch', 'UNKNOWN')}")
-                logger.info(f"      Enabled: {admin_state.get('enabled', 'UNKNOWN')}")
+                logger.info("   ✅ Found in Admin API")
+                logger.info("      Status: %s", state.get('current_status', 'UNKNOWN'))
+                logger.info("      Epoch: %s", admin_state.get('epoch', 'UNKNOWN'))
+                logger.info("      Enabled: %s", admin_state.get('enabled', 'UNKNOWN'))
 
                 return True
 
             elif response.status_code == 404:
-                logger.error(f"   ❌ NOT FOUND in Admin API (404)")
-                logger.error(f"   This means registration did not actually succeed")
+                logger.error("   ❌ NOT FOUND in Admin API (404)")
+                logger.error("   This means registration did not actually succeed")
                 return False
 
             else:
-                logger.warning(f"   ⚠️  Verification check failed: HTTP {response.status_code}")
+                logger.warning("   ⚠️  Verification check failed: HTTP %s", response.status_code)
                 return False
 
         except Exception as e:
-            logger.warning(f"   ⚠️  Verification check error: {e}")
+            logger.warning("   ⚠️  Verification check error: %s", e)
             return False
 
     def disable_mlnode(self, instance_id: int) -> bool:
@@ -532,53 +578,51 @@ class MLNodePoCManager:
         but keeps it registered and running for the current epoch.
         """
         node_id = f"vastai-mlnode-{instance_id}"
-        logger.info(f"Disabling MLNode {node_id} (official graceful shutdown)...")
+        logger.info("Disabling MLNode %s (official graceful shutdown)...", node_id)
 
         try:
-            response = requests.post(
+            response = self.admin_session.post(
                 f"{self.admin_api_url}/admin/v1/nodes/{node_id}/disable",
-                headers={"Content-Type": "application/json"},
                 timeout=30
             )
 
             if response.status_code == 200:
-                logger.info(f"✅ MLNode {node_id} disabled (won't participate in next epoch)")
+                logger.info("✅ MLNode %s disabled (won't participate in next epoch)", node_id)
                 return True
             elif response.status_code == 404:
-                logger.info(f"ℹ️  Node {node_id} not found (already disabled or using on-chain registration)")
+                logger.info("ℹ️  Node %s not found (already disabled or using on-chain registration)", node_id)
                 return True  # Non-fatal, node is already inactive
             else:
-                logger.warning(f"Disable returned: {response.status_code}")
+                logger.warning("Disable returned: %s", response.status_code)
                 return False
 
         except Exception as e:
-            logger.warning(f"Failed to disable MLNode: {e}")
+            logger.warning("Failed to disable MLNode: %s", e)
             return True  # Non-fatal, allow cleanup to continue
 
     def unregister_mlnode(self, instance_id: int) -> bool:
         """Unregister MLNode from the Network Node"""
         node_id = f"vastai-mlnode-{instance_id}"
-        logger.info(f"Unregistering MLNode {node_id}...")
+        logger.info("Unregistering MLNode %s...", node_id)
 
         try:
-            response = requests.delete(
+            response = self.admin_session.delete(
                 f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
-                headers={"Content-Type": "application/json"},
                 timeout=30
             )
 
             if response.status_code == 200:
-                logger.info(f"✅ MLNode {node_id} unregistered")
+                logger.info("✅ MLNode %s unregistered", node_id)
                 return True
             elif response.status_code == 404:
-                logger.info(f"ℹ️  Node {node_id} not found in registry (already unregistered or using on-chain registration)")
+                logger.info("ℹ️  Node %s not found in registry (already unregistered or using on-chain registration)", node_id)
                 return True  # Non-fatal, node is gone anyway
             else:
-                logger.warning(f"Unregister returned: {response.status_code}")
+                logger.warning("Unregister returned: %s", response.status_code)
                 return False
 
         except Exception as e:
-            logger.warning(f"Failed to unregister MLNode: {e}")
+            logger.warning("Failed to unregister MLNode: %s", e)
             return True  # Non-fatal, allow cleanup to continue
 
     def wait_for_poc_completion(self, vastai_manager, instance_id: int, timeout: int = 3600) -> bool:
@@ -599,11 +643,11 @@ class MLNodePoCManager:
         Returns:
             True when PoC phase completes (or timeout reached)
         """
-        logger.info(f"Monitoring PoC progress for instance {instance_id}...")
-        logger.info(f"Timeout: {timeout}s (~{timeout//60} minutes for full PoC phase)")
+        logger.info("Monitoring PoC progress for instance %s...", instance_id)
+        logger.info("Timeout: %ss (~%s minutes for full PoC phase)", timeout, timeout//60)
         logger.info("Note: Direct MLNode monitoring - Network Node uses blockchain for PoC coordination")
 
-        start_time = time.time()
+        start_time = time.monotonic()
         check_count = 0
         saw_activity = False  # Track if we ever saw active PoC work
         node_id = f"vastai-mlnode-{instance_id}"
@@ -619,14 +663,14 @@ class MLNodePoCManager:
         mlnode_port = ssh_info['mlnode_port']
         mlnode_url = f"http://{mlnode_host}:{mlnode_port}"
 
-        logger.info(f"Monitoring MLNode at {mlnode_url}/api/v1/state")
+        logger.info("Monitoring MLNode at %s/api/v1/state", mlnode_url)
         logger.info("ℹ️  Waiting for PoC phase to start (MLNode will show INFERENCE state during active PoC)...")
 
-        while (time.time() - start_time) < timeout:
+        while (time.monotonic() - start_time) < timeout:
             check_count += 1
             try:
                 # Query MLNode directly instead of Network Node admin API
-                response = requests.get(
+                response = self._http.get(
                     f"{mlnode_url}/api/v1/state",
                     timeout=10
                 )
@@ -636,7 +680,7 @@ class MLNodePoCManager:
                     mlnode_status = state.get('state', 'UNKNOWN')
 
                     if mlnode_status != last_status:
-                        logger.info(f"MLNode Status: {mlnode_status}")
+                        logger.info("MLNode Status: %s", mlnode_status)
                         last_status = mlnode_status
 
                     # MLNode states during PoC:
@@ -661,13 +705,13 @@ class MLNodePoCManager:
 
             except requests.RequestException as e:
                 if check_count % 5 == 0:  # Log every 5 checks (2.5 minutes)
-                    logger.warning(f"Cannot reach MLNode: {e}")
-                    logger.info(f"   This is normal if PoC hasn't started yet")
+                    logger.warning("Cannot reach MLNode: %s", e)
+                    logger.info("   This is normal if PoC hasn't started yet")
 
             time.sleep(30)
 
-        logger.info(f"ℹ️  Monitoring completed after {timeout}s (timeout reached)")
-        logger.info(f"   MLNode is still running - Network Node manages PoC lifecycle")
+        logger.info("ℹ️  Monitoring completed after %ss (timeout reached)", timeout)
+        logger.info("   MLNode is still running - Network Node manages PoC lifecycle")
         return True  # Non-fatal - let scheduler decide cleanup
 
     def verify_poc_readiness(self, mlnode_url: str, instance_id: int, seconds_until_poc: int) -> bool:
@@ -683,47 +727,47 @@ class MLNodePoCManager:
             True if MLNode is ready for PoC
         """
         node_id = f"vastai-mlnode-{instance_id}"
-        logger.info(f"Verifying MLNode readiness for PoC ({seconds_until_poc}s until start)...")
+        logger.info("Verifying MLNode readiness for PoC (%ss until start)...", seconds_until_poc)
 
         # Check MLNode health endpoint
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{mlnode_url}{self.mlnode_api_segment}/state",
                 timeout=10
             )
 
             if response.status_code != 200:
-                logger.warning(f"⚠️  MLNode health check failed: {response.status_code}")
+                logger.warning("⚠️  MLNode health check failed: %s", response.status_code)
                 return False
 
             state_data = response.json()
             mlnode_state = state_data.get('state', 'UNKNOWN')
-            logger.info(f"✅ MLNode state verified: {mlnode_state}")
+            logger.info("✅ MLNode state verified: %s", mlnode_state)
 
             # Check Admin API registration
             try:
-                reg_response = requests.get(
+                reg_response = self.admin_session.get(
                     f"{self.admin_api_url}/admin/v1/nodes/{node_id}",
                     timeout=10
                 )
 
                 if reg_response.status_code == 200:
-                    logger.info(f"✅ MLNode registered in Admin API")
+                    logger.info("✅ MLNode registered in Admin API")
                     return True
                 elif reg_response.status_code == 404:
-                    logger.warning(f"⚠️  Node not in Admin API registry (using on-chain registration)")
+                    logger.warning("⚠️  Node not in Admin API registry (using on-chain registration)")
                     return True  # Non-fatal - on-chain registration is sufficient
                 else:
-                    logger.warning(f"⚠️  Admin API check failed: {reg_response.status_code}")
+                    logger.warning("⚠️  Admin API check failed: %s", reg_response.status_code)
                     return True  # Non-fatal - MLNode endpoint is responding
 
             except Exception as e:
-                logger.warning(f"⚠️  Admin API verification failed: {e}")
-                logger.info(f"   This is normal if using on-chain registration only")
+                logger.warning("⚠️  Admin API verification failed: %s", e)
+                logger.info("   This is normal if using on-chain registration only")
                 return True  # Non-fatal - endpoint is up
 
         except Exception as e:
-            logger.error(f"❌ MLNode readiness verification failed: {e}")
+            logger.error("❌ MLNode readiness verification failed: %s", e)
             return False
 
     def check_mlnode_health(self, mlnode_url: str) -> Dict:
@@ -735,7 +779,7 @@ class MLNodePoCManager:
         }
 
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{mlnode_url}{self.mlnode_api_segment}/state",
                 timeout=10
             )
@@ -777,7 +821,7 @@ def test_manager():
 
         # Check Network Node API
         try:
-            response = requests.get(f"{manager.admin_api_url}/admin/v1/nodes", timeout=5)
+            response = manager.admin_session.get(f"{manager.admin_api_url}/admin/v1/nodes", timeout=5)
             if response.status_code == 200:
                 nodes = response.json()
                 print(f"  ✅ Network Node API accessible")
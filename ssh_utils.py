@@ -0,0 +1,126 @@
+"""SSH helpers shared by the Vast.ai managers."""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import select
+import socket
+from typing import Iterator, Optional, Tuple
+
+import paramiko
+
+_LINE_BREAK_RE = re.compile(rb'\r\n|\r|\n')
+
+
+def load_private_key(path: str) -> Optional[paramiko.PKey]:
+    """
+    Parse a private key, trying the cheapest-to-sign types first.
+
+    Returns None if the file does not exist yet. Ed25519, ECDSA and RSA
+    keys are accepted.
+    """
+    if not os.path.exists(path):
+        return None
+
+    for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey):
+        try:
+            return key_class.from_private_key_file(path)
+        except (paramiko.SSHException, ValueError):
+            continue
+    return paramiko.RSAKey.from_private_key_file(path)
+
+
+def iter_channel_chunks(chan: paramiko.Channel, deadline: float) -> Iterator[Tuple[bool, bytes]]:
+    """
+    Yield (is_stderr, data) from a running command until both streams hit EOF.
+
+    sshd may send the exit status before the last output, so completion is
+    judged by EOF on stdout and stderr rather than by exit_status_ready().
+    Both streams are read as data arrives, so the remote never stalls on a
+    full window. Raises TimeoutError once the monotonic deadline passes, even
+    while the command is still producing output.
+    """
+    chan.settimeout(0.0)
+    open_streams = {False: chan.recv, True: chan.recv_stderr}
+
+    while open_streams:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Command timed out")
+
+        progressed = False
+        for is_stderr, recv in list(open_streams.items()):
+            try:
+                data = recv(65536)
+            except socket.timeout:
+                continue
+            progressed = True
+            if not data:
+                del open_streams[is_stderr]
+            else:
+                yield is_stderr, data
+
+        if not progressed:
+            # Only stdout wakes the channel's select pipe, so keep the wait
+            # short enough that stderr-only output is still picked up promptly
+            select.select([chan], [], [], min(0.2, remaining))
+
+
+def iter_channel_lines(
+    chan: paramiko.Channel, timeout: float, stderr: bytearray
+) -> Iterator[str]:
+    """
+    Yield stdout lines of a running command as they arrive.
+
+    Lines end at LF, CRLF or a bare CR, so progress bars split per update.
+    stderr is collected into the given buffer. Raises TimeoutError past the deadline.
+    """
+    buffer = b""
+    for is_stderr, data in iter_channel_chunks(chan, time.monotonic() + timeout):
+        if is_stderr:
+            stderr += data
+            continue
+        buffer += data
+        *lines, buffer = _LINE_BREAK_RE.split(buffer)
+        for line in lines:
+            yield line.decode('utf-8', 'replace')
+    if buffer:
+        yield buffer.decode('utf-8', 'replace')
+
+
+def collect_channel(
+    chan: paramiko.Channel, timeout: float, max_bytes: int = 1 << 20
+) -> Tuple[int, str, str]:
+    """
+    Run a started command to completion and return its output.
+
+    Reads until EOF on both streams, then waits for the exit status. Only the
+    last max_bytes of each stream are kept. The channel is closed on return.
+
+    Returns:
+        (exit_code, stdout, stderr); exit_code is -1 on timeout
+    """
+    deadline = time.monotonic() + timeout
+    streams = {False: bytearray(), True: bytearray()}
+
+    try:
+        for is_stderr, data in iter_channel_chunks(chan, deadline):
+            buf = streams[is_stderr]
+            buf += data
+            if len(buf) > max_bytes:
+                del buf[:-max_bytes]
+        if not chan.status_event.wait(max(0.0, deadline - time.monotonic())):
+            raise TimeoutError("Command timed out")
+    except TimeoutError:
+        chan.close()
+        return (-1, streams[False].decode('utf-8', 'replace'), "Command timed out")
+
+    exit_code = chan.recv_exit_status()
+    chan.close()
+    return (
+        exit_code,
+        streams[False].decode('utf-8', 'replace'),
+        streams[True].decode('utf-8', 'replace'),
+    )
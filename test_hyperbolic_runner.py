@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Hyperbolic Runner request encoding
+Offline test - no API calls are made
+"""
+
+import sys
+import json
+import importlib.util
+
+# Load runner
+spec = importlib.util.spec_from_file_location("hyperbolic_runner", "scripts/4_hyperbolic_runner.py")
+runner_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(runner_module)
+
+ChatMessage = runner_module.ChatMessage
+
+
+def test_text_messages():
+    """Test 1: Plain text messages encode to the expected body"""
+    print("\n" + "="*60)
+    print("  TEST 1: Text Message Encoding")
+    print("="*60 + "\n")
+
+    messages = [
+        ChatMessage(role="system", content="You are a helpful AI assistant."),
+        ChatMessage(role="user", content="Hello"),
+    ]
+
+    try:
+        body = json.loads(runner_module._encode_chat_payload("m", messages, 0.7, 16, False))
+        assert body["messages"] == [
+            {"role": "system", "content": "You are a helpful AI assistant."},
+            {"role": "user", "content": "Hello"},
+        ]
+        print("✅ Text messages encoded correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Encoding failed: {e!r}")
+        return False
+
+
+def test_multimodal_messages():
+    """Test 2: Messages whose content is a list of parts encode unchanged"""
+    print("\n" + "="*60)
+    print("  TEST 2: Multimodal Message Encoding")
+    print("="*60 + "\n")
+
+    parts = [
+        {"type": "text", "text": "What is in this image?"},
+        {"type": "image_url", "image_url": {"url": "https://example.com/cat.png"}},
+    ]
+    messages = [
+        ChatMessage(role="system", content="You are a helpful AI assistant."),
+        ChatMessage(role="user", content=parts),
+    ]
+
+    try:
+        body = json.loads(runner_module._encode_chat_payload("m", messages, 0.7, 16, False))
+        assert body["messages"][1] == {"role": "user", "content": parts}
+        print("✅ List content encoded correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Encoding failed: {e!r}")
+        return False
+
+
+def main():
+    results = [
+        ("Text message encoding", test_text_messages()),
+        ("Multimodal message encoding", test_multimodal_messages()),
+    ]
+
+    print("\n" + "="*60)
+    print("  TEST SUMMARY")
+    print("="*60 + "\n")
+
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{status} - {test_name}")
+
+    print(f"\n{passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)